@@ -0,0 +1,460 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 18 10:12:31 2026
+
+@author: Thommes Eliott
+"""
+
+# Benchmark library for the data loading and treatment methods
+
+# Other Lib
+import time
+import numpy as np
+
+# Custom Lib
+from DataTableLib import DataTable
+from MathOperationLib import DataTreatment
+from ConcreteCarbonationLib import CarboSaettaFD, CarboSaettaAnal, CarboSweep, TransportAdvecDiff
+
+
+# Timing
+def BenchTime(Function, *args, NRepeat=1, **kwargs):
+    """
+    Times a function call.
+
+    Args:
+        Function (callable): Function to time.
+        NRepeat (int): Number of repetitions, the best time is kept.
+
+    Returns:
+        BestTime (float): Best time over the repetitions (s).
+        Result: Result of the last call.
+    """
+    BestTime = np.inf
+    Result = None
+    for _ in range(NRepeat):
+        Start = time.perf_counter()
+        Result = Function(*args, **kwargs)
+        BestTime = min(BestTime, time.perf_counter() - Start)
+    return BestTime, Result
+
+
+# Lagamine .f71 files
+def BenchWriteF71(FileName, SizeMB=1024, NElement=1000, NValPerLine=6, NVal=9, Seed=0):
+    """
+    Writes a synthetic Lagamine .f71 file.
+    Each element has a label line with its number and the time, followed by its values.
+    Every group is then a row [Element, Time, Values...] of the data matrix.
+
+    Args:
+        FileName (str): Path of the file.
+        SizeMB (float): Approximate size of the file (MB).
+        NElement (int): Number of elements per time step.
+        NValPerLine (int): Number of values per line.
+        NVal (int): Number of values per element.
+        Seed (int): Seed of the random generator.
+    """
+    Rng = np.random.default_rng(Seed)
+
+    # Text of one time step, the values are the same for every time step
+    Lines = []
+    for Element in range(NElement):
+        Values = Rng.standard_normal(NVal)
+        Lines.append(f" ELEMENT {Element + 1:8d}   TIME = @TIME@\n")
+        for Start in range(0, NVal, NValPerLine):
+            Lines.append(" ".join(f"{Val:14.6E}" for Val in Values[Start:Start + NValPerLine]) + "\n")
+    StepText = "".join(Lines)
+
+    SizeMax = SizeMB * 2**20
+    Size = 0
+    Step = 0
+    with open(FileName, 'w') as file:
+        file.write(" LAGAMINE - SYNTHETIC RESULT FILE\n")
+        while Size < SizeMax:
+            Step += 1
+            Text = StepText.replace("@TIME@", f"{Step * 3600.0:14.6E}")
+            file.write(Text)
+            Size += len(Text)
+    print(f"Info: {FileName} written ({Size / 2**20:.1f} MB, {Step} time steps).")
+
+def BenchLoadF71(FileName, NRepeat=1, DataClass=DataTable):
+    """
+    Compares the line by line and the vectorized parsers of the .f71 files.
+
+    Args:
+        FileName (str): Path of the file.
+        NRepeat (int): Number of repetitions, the best time is kept.
+        DataClass (type): Class benchmarked, DataTable or one of its subclasses (DataLag, DataRecord).
+
+    Returns:
+        Results (dict): Times of both engines (s), speedup and equality of the groups.
+    """
+    Data = DataClass()
+    Data.getFileName = FileName
+
+    TimePython, DataRowsPython = BenchTime(Data.LoadFile, Engine="python", NRepeat=NRepeat)
+    TimeNumpy, DataRowsNumpy = BenchTime(Data.LoadFile, Engine="numpy", NRepeat=NRepeat)
+
+    BSame = len(DataRowsPython) == len(DataRowsNumpy) and \
+        all(np.array_equal(np.asarray(Row1), Row2, equal_nan=True) for Row1, Row2 in zip(DataRowsPython, DataRowsNumpy))
+
+    print(f"Python engine: {TimePython:.3f} s")
+    print(f"NumPy engine: {TimeNumpy:.3f} s")
+    print(f"Speedup: {TimePython / TimeNumpy:.1f}x, same groups: {BSame}")
+    return {'Python': TimePython, 'Numpy': TimeNumpy, 'Speedup': TimePython / TimeNumpy, 'Same': BSame}
+
+def BenchCache(FileName, NRepeat=1, DataClass=DataTable):
+    """
+    Compares the parsing of a file with the opening of its binary cache.
+
+    Args:
+        FileName (str): Path of the file.
+        NRepeat (int): Number of repetitions, the best time is kept.
+        DataClass (type): Class benchmarked, DataTable or one of its subclasses (DataLag, DataRecord).
+
+    Returns:
+        Results (dict): Times of the parsing and of the cache opening (s).
+    """
+    Data = DataClass()
+    Data.getFileName = FileName
+
+    TimeParse, _ = BenchTime(Data.LoadFile, BLoadMatrix=True, NRepeat=NRepeat)
+    Data.SaveCache()
+    TimeCache, _ = BenchTime(Data.LoadFile, BCache=True, NRepeat=NRepeat)
+
+    print(f"Parsing: {TimeParse:.3f} s")
+    print(f"Cache: {TimeCache:.3f} s")
+    return {'Parse': TimeParse, 'Cache': TimeCache}
+
+# Acquisition .txt files
+def BenchWriteTxt(FileName, NRows=10**6, NCols=8, Seed=0):
+    """
+    Writes a synthetic whitespace-delimited acquisition file.
+
+    Args:
+        FileName (str): Path of the file.
+        NRows (int): Number of rows.
+        NCols (int): Number of columns.
+        Seed (int): Seed of the random generator.
+    """
+    Rng = np.random.default_rng(Seed)
+    Matrix = Rng.standard_normal((NRows, NCols)) * 10.0**Rng.integers(-5, 5, (NRows, NCols))
+    Matrix[:, 0] = np.arange(NRows)  # Time column
+    np.savetxt(FileName, Matrix, fmt='%.10e', delimiter='   ')
+
+def BenchLoadTxt(FileName, NRepeat=1, DataClass=DataTable):
+    """
+    Compares the python engine and the C engine of pandas for the .csv and .txt files.
+
+    Args:
+        FileName (str): Path of the file.
+        NRepeat (int): Number of repetitions, the best time is kept.
+        DataClass (type): Class benchmarked, DataTable or one of its subclasses (DataLag, DataRecord).
+
+    Returns:
+        Results (dict): Times of both engines (s), speedup and equality of the data.
+    """
+    Data = DataClass()
+    Data.getFileName = FileName
+
+    TimePython, DataPython = BenchTime(Data.LoadFile, Engine="python", NRepeat=NRepeat)
+    TimeNumpy, DataNumpy = BenchTime(Data.LoadFile, Engine="numpy", NRepeat=NRepeat)
+    BSame = np.array_equal(DataPython, DataNumpy, equal_nan=True)
+
+    print(f"Python engine: {TimePython:.3f} s")
+    print(f"C engine: {TimeNumpy:.3f} s")
+    print(f"Speedup: {TimePython / TimeNumpy:.1f}x, same data: {BSame}")
+    return {'Python': TimePython, 'Numpy': TimeNumpy, 'Speedup': TimePython / TimeNumpy, 'Same': BSame}
+
+# Selections
+def BenchSelectIndex(NRows=10**7, NSteps=1000, NSelect=100, Seed=0, DataClass=DataTable):
+    """
+    Compares the full scan of a column with the sorted index used by DataTable.SelectIndex.
+
+    Args:
+        NRows (int): Number of rows of the data matrix.
+        NSteps (int): Number of time steps in the time column.
+        NSelect (int): Number of selections timed.
+        Seed (int): Seed of the random generator.
+        DataClass (type): Class benchmarked, DataTable or one of its subclasses (DataLag, DataRecord).
+
+    Returns:
+        Results (dict): Mean time per selection of the full scan and of the index (s), time to build the index (s).
+    """
+    Rng = np.random.default_rng(Seed)
+    Data = DataClass()
+    Data.getDataMatrix = np.column_stack((Rng.integers(0, NSteps, NRows) * 10.0, Rng.standard_normal(NRows)))
+    Data.getTimeCol = 0
+    TimeSteps = Rng.integers(0, NSteps, NSelect) * 10.0
+
+    # Full scan of the column
+    Start = time.perf_counter()
+    for Val in TimeSteps:
+        np.where(np.abs(Data.getDataMatrix[:, 0] - Val) <= 0)[0]
+    TimeScan = (time.perf_counter() - Start) / NSelect
+
+    # Sorted index
+    TimeBuild, _ = BenchTime(Data.GetColIndex, 0)
+    Start = time.perf_counter()
+    for Val in TimeSteps:
+        Data.getPLTIndex = None
+        Data.SelectTime(Val=Val)
+    TimeIndex = (time.perf_counter() - Start) / NSelect
+
+    print(f"Full scan: {TimeScan * 1e3:.3f} ms per selection")
+    print(f"Sorted index: {TimeIndex * 1e3:.3f} ms per selection (index built in {TimeBuild:.3f} s)")
+    print(f"Speedup: {TimeScan / TimeIndex:.1f}x")
+    return {'Scan': TimeScan, 'Index': TimeIndex, 'Build': TimeBuild}
+
+
+def SelectIndexNoDuplicateLoop(ArrayExtractedVal, Tol=0.001, AbsTol=None, ValPolicy=0):
+    """
+    Former loop of DataTable.SelectIndexNoDuplicate, kept as reference for BenchSelectIndexNoDuplicate.
+
+    Returns:
+        NewPLTIndex (numpy.ndarray): Sorted indexes of the kept values.
+    """
+    # In case AbsTol is None, the tolerance is set based on the relative tolerance
+    if AbsTol is None:
+        BRelTol = True
+    else:
+        BRelTol = False
+
+    # Sort the values and keep the indices
+    SortedIndices = np.argsort(ArrayExtractedVal)
+    SortedArrayExtractedVal = ArrayExtractedVal[SortedIndices]
+
+    # Append a dummy value to trigger final group processing
+    if BRelTol:
+        DummyVal = SortedArrayExtractedVal[-1] + 10 * np.abs(Tol * (SortedArrayExtractedVal[-1] + 1))
+    else:
+        DummyVal = SortedArrayExtractedVal[-1] + 10 * AbsTol
+
+    SortedArrayExtractedVal = np.append(SortedArrayExtractedVal, DummyVal)
+    SortedIndices = np.append(SortedIndices, -1) # dummy index to match length
+
+    NewPLTIndex = []  # Index kept for the unique values
+    TempIndexList = []  # List to keep temporarily the indices of the duplicates
+    Counter = 0  # Counter for duplicates
+
+    for i in range(len(SortedArrayExtractedVal) - 1):
+        CurrentVal = SortedArrayExtractedVal[i]
+        NextVal = SortedArrayExtractedVal[i + 1]
+
+        # Get the accepted absolute tolerance if not given. Based on the relative tolerance
+        if BRelTol:
+            AbsTol = np.abs(Tol * CurrentVal)
+
+        # Check if the difference between the current and previous value is greater than the absolute tolerance
+        if np.abs(NextVal - CurrentVal) > AbsTol:
+            # The value is unique
+            if Counter == 0:
+                # If the value is unique, keep it
+                NewPLTIndex.append(SortedIndices[i])
+            else:
+                # If there are duplicates values
+
+                # Add the last index of the duplicates in the temporary list
+                TempIndexList.append(SortedIndices[i])
+
+                # Choose the index to be kept
+                KeptSubIndex = ValPolicy
+
+                if KeptSubIndex >= len(TempIndexList):
+                    # If the number of duplicates is less than the value to keep, take the last one
+                    KeptSubIndex = -1
+                elif KeptSubIndex < -1:
+                    # If the value to keep is negative, take the last one
+                    KeptSubIndex = -1
+
+                if TempIndexList[KeptSubIndex] != -1:
+                    NewPLTIndex.append(TempIndexList[KeptSubIndex])
+
+            # Reset the list of temporary indexess
+            TempIndexList = []
+            # Reset the counter
+            Counter = 0
+
+        else:
+            # The value is not unique and needs to be kept to check after wich one to choose
+            TempIndexList.append(SortedIndices[i])  # Keep the index of the duplicate value
+            # Update the counter
+            Counter += 1
+
+    # Sort the index of the kept values by resorting the original array
+    NewPLTIndex = np.array(NewPLTIndex)
+    NewPLTIndex = np.sort(NewPLTIndex)
+    return NewPLTIndex
+
+def BenchSelectIndexNoDuplicate(NRows=10**6, NTrials=200, Seed=0, DataClass=DataTable):
+    """
+    Cross-checks the vectorized DataTable.SelectIndexNoDuplicate against the former loop on random data,
+    for every kind of ValPolicy and both tolerance modes, then times both on NRows rows.
+
+    Args:
+        NRows (int): Number of rows of the timed data.
+        NTrials (int): Number of small random cases cross-checked.
+        Seed (int): Seed of the random generator.
+        DataClass (type): Class benchmarked, DataTable or one of its subclasses (DataLag, DataRecord).
+
+    Returns:
+        Results (dict): Number of mismatches, times of the loop and of the vectorized version (s).
+    """
+    Rng = np.random.default_rng(Seed)
+    Data = DataClass()
+
+    NMismatch = 0
+    for _ in range(NTrials):
+        NRowsTrial = int(Rng.integers(1, 300))
+        Values = np.round(Rng.standard_normal(NRowsTrial), int(Rng.integers(0, 3)))
+        for Tol, AbsTol in ((0.001, None), (0.05, None), (0, None), (0.001, 0.0), (0.001, 0.05)):
+            for ValPolicy in (-3, -1, 0, 1, 2, 10):
+                Data.getDataMatrix = Values[:, np.newaxis]
+                Data.getPLTIndex = None
+                Data.SelectIndexNoDuplicate(Col=0, Tol=Tol, AbsTol=AbsTol, ValPolicy=ValPolicy)
+                Reference = SelectIndexNoDuplicateLoop(Values, Tol=Tol, AbsTol=AbsTol, ValPolicy=ValPolicy)
+                if not np.array_equal(Data.getPLTIndex, Reference):
+                    NMismatch += 1
+    print(f"Cross-check: {NMismatch} mismatches")
+
+    # Timing
+    Values = np.round(Rng.standard_normal(NRows), 3)
+    TimeLoop, _ = BenchTime(SelectIndexNoDuplicateLoop, Values, Tol=0.001, ValPolicy=1)
+    Data.getDataMatrix = Values[:, np.newaxis]
+    Data.getPLTIndex = None
+    TimeVect, _ = BenchTime(Data.SelectIndexNoDuplicate, Col=0, Tol=0.001, ValPolicy=1)
+
+    print(f"Loop: {TimeLoop:.3f} s")
+    print(f"Vectorized: {TimeVect:.3f} s")
+    print(f"Speedup: {TimeLoop / TimeVect:.1f}x")
+    return {'Mismatch': NMismatch, 'Loop': TimeLoop, 'Vectorized': TimeVect}
+
+
+# Filters
+def BenchKalman(NSamples=10**5, NChannels=4, Seed=0, **Model):
+    """
+    Compares the scalar Kalman filter and smoother of DataTreatment.DTKalman with pykalman, channel by channel.
+
+    Args:
+        NSamples (int): Number of samples per channel.
+        NChannels (int): Number of channels.
+        Seed (int): Seed of the random generator.
+        Model: Scalar model of DTKalman (TransitionMatrix, ObservationCovariance...).
+
+    Returns:
+        Results (dict): Times of both filters (s) and largest differences of the filtered and smoothed states.
+    """
+    from pykalman import KalmanFilter
+
+    Rng = np.random.default_rng(Seed)
+    Data = np.cumsum(Rng.standard_normal((NSamples, NChannels)), axis=0) + Rng.standard_normal((NSamples, NChannels))
+    Treatment = DataTreatment()
+    Params = {'TransitionMatrix': 1, 'ObservationMatrix': 1, 'InitialStateMean': 0, 'InitialStateCovariance': 1,
+              'ObservationCovariance': 1, 'TransitionCovariance': 0.01}
+    Params.update(Model)
+
+    TimeFast, Filtered = BenchTime(Treatment.DTKalman, Data, **Params)
+    Smoothed = Treatment.DTKalman(Data, BSmooth=True, **Params)
+
+    Filter = KalmanFilter(transition_matrices=Params['TransitionMatrix'], observation_matrices=Params['ObservationMatrix'],
+                          initial_state_mean=Params['InitialStateMean'], initial_state_covariance=Params['InitialStateCovariance'],
+                          observation_covariance=Params['ObservationCovariance'], transition_covariance=Params['TransitionCovariance'])
+    Start = time.perf_counter()
+    Reference = np.column_stack([Filter.filter(Data[:, Channel])[0].ravel() for Channel in range(NChannels)])
+    TimePykalman = time.perf_counter() - Start
+    ReferenceSmoothed = np.column_stack([Filter.smooth(Data[:, Channel])[0].ravel() for Channel in range(NChannels)])
+
+    ErrorFilter = np.max(np.abs(Filtered - Reference))
+    ErrorSmoother = np.max(np.abs(Smoothed - ReferenceSmoothed))
+    print(f"Scalar filter: {TimeFast:.4f} s")
+    print(f"pykalman: {TimePykalman:.3f} s")
+    print(f"Speedup: {TimePykalman / TimeFast:.0f}x, largest difference: {ErrorFilter:.2e} (filter), {ErrorSmoother:.2e} (smoother)")
+    return {'Fast': TimeFast, 'Pykalman': TimePykalman, 'ErrorFilter': ErrorFilter, 'ErrorSmoother': ErrorSmoother}
+
+def BenchCarboSweep(NRH=100, NT=100, tMax=50, Dt=10, NBatch=4):
+    """
+    Compares CarboSweep with a loop of calls on CarboSaettaAnal, and checks the batched advection-diffusion model
+    (arrays of velocities and concentrations) against scalar calls.
+
+    Args:
+        NRH, NT (int): Number of relative humidities and temperatures of the Saetta sweep.
+        tMax, Dt (float): Time grid of the Saetta sweep.
+        NBatch (int): Number of velocities and of concentrations of the advection-diffusion sweep.
+
+    Returns:
+        Results (dict): Times (s) and largest differences between the sweeps and the scalar calls.
+    """
+    RHArray = np.linspace(0.55, 1, NRH)
+    TArray = np.linspace(275, 310, NT)
+    Start = time.perf_counter()
+    Loop = np.array([[np.stack(CarboSaettaAnal(0.04, 80, tMax, Dt, RH, T)[1:]) for T in TArray] for RH in RHArray])
+    TimeLoop = time.perf_counter() - Start
+    TimeSweep, Cube = BenchTime(CarboSweep, 'CarboSaettaAnal', {'RH': RHArray, 'T': TArray}, Cco2Ini=0.04, Ccaoh2Ini=80,
+                                tMax=tMax, Dt=Dt)
+    ErrorSaetta = np.max(np.abs(Cube.Values - Loop))
+
+    uArray = np.linspace(0, 1e-3, NBatch)
+    Cco20Array = np.linspace(0.5, 2, NBatch)
+    Grid = {'Xini': 0, 'Xmax': 0.05, 'Dx': 0.001, 'tMax': 10, 'Dt': 0.1, 'DiffCoef': 1e-4}
+    Cube = CarboSweep('TransportAdvecDiff', {'u': uArray, 'Cco20': Cco20Array}, **Grid)
+    ErrorAdvecDiff = max(np.max(np.abs(Cube.Values[i, j] - TransportAdvecDiff(**Grid, Cco20=Cco20, u=u)[2]))
+                         for i, u in enumerate(uArray) for j, Cco20 in enumerate(Cco20Array))
+
+    print(f"Loop over {NRH*NT} scenarios: {TimeLoop:.3f} s")
+    print(f"CarboSweep: {TimeSweep:.4f} s")
+    print(f"Speedup: {TimeLoop / TimeSweep:.0f}x, largest difference: {ErrorSaetta:.2e}")
+    print(f"Batched u and Cco20 of TransportAdvecDiff, largest difference with scalar calls: {ErrorAdvecDiff:.2e}")
+    return {'Loop': TimeLoop, 'Sweep': TimeSweep, 'ErrorSaetta': ErrorSaetta, 'ErrorAdvecDiff': ErrorAdvecDiff}
+
+def BenchCarboSaettaFD(tMax=10*3.15e7, Dt=600, RH=0.7, T=293, Cco2Ini=0.04, Ccaoh2Ini=80, NScenarios=100):
+    """
+    Compares the engines of CarboSaettaFD (Euler loop, solve_ivp, Euler on a batch of scenarios), validated against CarboSaettaAnal.
+
+    Args:
+        tMax (float): Maximum time (s).
+        Dt (float): Time step (s).
+        RH, T, Cco2Ini, Ccaoh2Ini (float): Scenario of the single runs.
+        NScenarios (int): Number of scenarios (relative humidities between 0.55 and 1) of the batch runs.
+
+    Returns:
+        Results (dict): Times (s) and largest relative differences with the analytical solution.
+    """
+    Args = (Cco2Ini, Ccaoh2Ini, tMax, Dt)
+    Reference = CarboSaettaAnal(*Args, RH, T)
+    TimeEuler, Euler = BenchTime(CarboSaettaFD, *Args, RH, T)
+    TimeODE, ODE = BenchTime(CarboSaettaFD, *Args, RH, T, Engine='ODE')
+    ErrorEuler = max(np.max(np.abs(Euler[i] - Reference[i])) / np.max(np.abs(Reference[i])) for i in (1, 2, 3))
+    ErrorODE = max(np.max(np.abs(ODE[i] - Reference[i])) / np.max(np.abs(Reference[i])) for i in (1, 2, 3))
+
+    RHArray = np.linspace(0.55, 1, NScenarios)
+    TimeBatch, _ = BenchTime(CarboSaettaFD, *Args, RHArray, T)
+    print(f"Euler loop: {TimeEuler:.3f} s, largest relative difference with CarboSaettaAnal: {ErrorEuler:.2e}")
+    print(f"solve_ivp: {TimeODE:.3f} s, largest relative difference with CarboSaettaAnal: {ErrorODE:.2e}")
+    print(f"Speedup: {TimeEuler / TimeODE:.0f}x")
+    print(f"Euler on {NScenarios} scenarios: {TimeBatch:.3f} s ({TimeEuler * NScenarios / TimeBatch:.0f}x a loop over the scenarios)")
+    return {'Euler': TimeEuler, 'ODE': TimeODE, 'Batch': TimeBatch, 'ErrorEuler': ErrorEuler, 'ErrorODE': ErrorODE}
+
+# Suite
+def BenchAll(DataClass=DataTable, FileNameF71=None, FileNameTxt=None, NRepeat=1):
+    """
+    Runs the benchmarks of the loading and selection methods for a class (DataTable, DataLag or DataRecord).
+
+    Args:
+        DataClass (type): Class benchmarked.
+        FileNameF71 (str): .f71 file of the loading benchmarks, skipped if None.
+        FileNameTxt (str): .txt file of the loading benchmarks, skipped if None.
+        NRepeat (int): Number of repetitions of the loading benchmarks, the best time is kept.
+
+    Returns:
+        Results (dict): Results of each benchmark.
+    """
+    Results = {}
+    print(f"Benchmarks of {DataClass.__name__}")
+    if FileNameF71 is not None:
+        Results['LoadF71'] = BenchLoadF71(FileNameF71, NRepeat=NRepeat, DataClass=DataClass)
+        Results['Cache'] = BenchCache(FileNameF71, NRepeat=NRepeat, DataClass=DataClass)
+    if FileNameTxt is not None:
+        Results['LoadTxt'] = BenchLoadTxt(FileNameTxt, NRepeat=NRepeat, DataClass=DataClass)
+    Results['SelectIndex'] = BenchSelectIndex(DataClass=DataClass)
+    Results['SelectIndexNoDuplicate'] = BenchSelectIndexNoDuplicate(DataClass=DataClass)
+    return Results
@@ -8,7 +8,11 @@ Created on Fri Feb 21 11:24:54 2025
 # Carbonation of concrete Library
 import numpy as np
 import math
+import inspect
 import scipy.special
+from scipy.integrate import solve_ivp
+import scipy.linalg
+from concurrent.futures import ProcessPoolExecutor
 
 # Custom Lib
 
@@ -17,7 +21,7 @@ import scipy.special
 # Methods
 
 # Transport model
-def TransportDiff(Xini, Xmax, Dx, tMax, Dt, Cco20, DiffCoef):
+def TransportDiff(Xini, Xmax, Dx, tMax, Dt, Cco20, DiffCoef, MaxMemory=None, Out=None, Callback=None):
     """
     Diffusion model
 
@@ -27,13 +31,17 @@ def TransportDiff(Xini, Xmax, Dx, tMax, Dt, Cco20, DiffCoef):
         Dx (float): Spatial step.
         tMax (float): Maximum time.
         Dt (float): Time step.
-        Cco20 (float): Initial CO2 concentration.
-        DiffCoef (float): Diffusion coefficient.
+        Cco20 (float or array): Initial CO2 concentration.
+        DiffCoef (float or array): Diffusion coefficient.
+        MaxMemory (int): Memory budget in bytes, the grid is then computed by blocks of time steps (see TransportBlocks).
+        Out (numpy.ndarray or str): Output array, or name of a .npy file written as a memory map.
+        Callback (callable): Function f(Start, TimeBlock, CBlock) called for each block of time steps.
 
     Returns:
         TimeArray (numpy.ndarray): Array of time steps.
         XArray (numpy.ndarray): Array of spatial positions.
-        CArray (numpy.ndarray): Computed concentration values over time and space.
+        CArray (numpy.ndarray): Computed concentration values over time and space (None if only Callback),
+                                with the leading batch axes of the array parameters.
     """
     
     # Generate spatial and temporal grid
@@ -42,20 +50,17 @@ def TransportDiff(Xini, Xmax, Dx, tMax, Dt, Cco20, DiffCoef):
     NStepsX = int((Xmax-Xini)/Dx) + 1
     XArray = np.linspace(Xini, Xmax, NStepsX) - Xini
 
-    # Create time and space matrices using broadcasting
-    TimeMatrix = TimeArray[:, np.newaxis]  # Shape: (NSteps, 1)
-    XMatrix = XArray[np.newaxis, :]     # Shape: (1, NStepX)
-
-    # Compute diffusion profile efficiently using NumPy broadcasting
-    CMatrix = Cco20 * (1 - scipy.special.erf(XMatrix / (2 * np.sqrt(DiffCoef * TimeMatrix)) ))
-    
-    # Impose that the concentration at the boundaries is the initial concentration
-    CMatrix[:, 0] = Cco20
+    # Compute diffusion profile by blocks of time steps
+    # (the concentration at the boundary is the initial concentration)
+    BatchShape = np.broadcast_shapes(np.shape(Cco20), np.shape(DiffCoef))
+    Cco20, DiffCoef = BatchGrid(Cco20), BatchGrid(DiffCoef)
+    CMatrix = TransportBlocks(TimeArray, XArray, lambda TimeMatrix, XMatrix: DiffProfile(TimeMatrix, XMatrix, Cco20, DiffCoef),
+                              MaxMemory, Out, Callback, BatchShape=BatchShape)
 
     XArray = XArray + Xini
     return TimeArray, XArray, CMatrix
 
-def TransportAdvec(Xini, Xmax, tMax, Dt, Cco20, u):
+def TransportAdvec(Xini, Xmax, tMax, Dt, Cco20, u, BCompact=False):
     """
     Advection model
 
@@ -67,11 +72,12 @@ def TransportAdvec(Xini, Xmax, tMax, Dt, Cco20, u):
         Cco20 (float): Initial CO2 concentration.
         u (float): Advection velocity.
         CoefSmallDx (float): Coefficient for the smaller spatial step.
+        BCompact (bool): If True, CArray is an AdvecFront (front index per time step) instead of the dense matrix.
 
     Returns:
         TimeArray (numpy.ndarray): Array of time steps.
         XArray (numpy.ndarray): Array of spatial positions
-        CArray (numpy.ndarray): Computed concentration values over time and space.
+        CArray (numpy.ndarray or AdvecFront): Computed concentration values over time and space.
     """
     # Verify that the advection velocity is positive
     if u <= 0:
@@ -86,44 +92,57 @@ def TransportAdvec(Xini, Xmax, tMax, Dt, Cco20, u):
     CoefSmallDx = 0  # The smaller the value the closer to the exact solution with step function
     SmallDx = CoefSmallDx * Dx
     ComplementDX = Dx - SmallDx
-    XList = [Xini]
-    XCurrent = Xini
-    Toggle = False  # Start with ComplementDX
-
-    while True:
-        Step = ComplementDX if Toggle else SmallDx
-        NextVal = XCurrent + Step
-
-        # If the next value goes beyond Xmax, stop or append Xmax if needed
-        if NextVal >= Xmax:
-            if not np.isclose(XCurrent, Xmax):
-                XList.append(Xmax)  # Append final step to reach Xmax exactly
-            break
 
-        XList.append(NextVal)
-        XCurrent = NextVal
-        Toggle = not Toggle  # Alternate between Dx and SmallDx
+    # Positions alternating SmallDx and ComplementDX from Xini (sequential sum), up to the first one reaching Xmax
+    NPairs = int(np.ceil((Xmax - Xini) / Dx)) + 2 if Xmax > Xini else 1
+    Steps = np.tile([SmallDx, ComplementDX], NPairs)
+    XArray = np.cumsum(np.concatenate(([Xini], Steps)))
+    NLast = int(np.argmax(XArray[1:] >= Xmax)) + 1
+    XArray = XArray[:NLast]
+    if not np.isclose(XArray[-1], Xmax):
+        XArray = np.append(XArray, Xmax)  # Append final step to reach Xmax exactly
 
-    XArray = np.array(XList)
-    
-    CMatrix = np.zeros((len(TimeArray), len(XArray)))
-    
-    # Initial condition
-    CMatrix[0, :] = 0
-    CMatrix[0, 0] = Cco20
-
-    # Time-stepping loop
-    for i in range(1, len(TimeArray)):
-        # Translation of the concentration profile to the smaller spatial step
-        CMatrix[i, 1:] = CMatrix[i-1, :-1]
-        CMatrix[i, 0] = Cco20
-        # Translation of the concentration profile to the larger spatial step so that total step is Dx
-        CMatrix[i, 1:] = CMatrix[i, :-1]
-        CMatrix[i, 0] = Cco20
+    # Each time step translates the profile by SmallDx then ComplementDX: two positions per time step
+    CMatrix = AdvecFront(TimeArray, XArray, 2 * np.arange(NStepst), Cco20)
+    if not BCompact:
+        CMatrix = CMatrix.Dense()
 
     return TimeArray, XArray, CMatrix
 
-def TransportAdvecDiff(Xini, Xmax, Dx, tMax, Dt, Cco20, DiffCoef, u=0):
+"""
+AdvecFront
+
+Compact result of the advection model: the concentration is Cco20 up to the front index and null after it.
+Indexing (Front[i], Front[i, j], Front[Start:Stop]...) computes only the requested values of the dense matrix.
+"""
+class AdvecFront:
+    def __init__(self, TimeArray, XArray, FrontIndex, Cco20):
+        self.TimeArray = TimeArray
+        self.XArray = XArray
+        self.FrontIndex = FrontIndex  # Last index at Cco20 for each time step
+        self.Cco20 = Cco20
+
+    @property
+    def shape(self):
+        return (len(self.TimeArray), len(self.XArray))
+
+    @property
+    def XFront(self):
+        """ Position of the front at each time step."""
+        return self.XArray[np.minimum(self.FrontIndex, len(self.XArray) - 1)]
+
+    def __getitem__(self, Key):
+        if not isinstance(Key, tuple):
+            Key = (Key,)
+        Key = Key + (slice(None),) * (2 - len(Key))
+        Front = self.FrontIndex[Key[0]]
+        Cols = np.arange(len(self.XArray))[Key[1]]
+        return np.where(np.greater_equal.outer(Front, Cols), float(self.Cco20), 0.0)
+
+    def Dense(self):
+        return self[:, :]
+
+def TransportAdvecDiff(Xini, Xmax, Dx, tMax, Dt, Cco20, DiffCoef, u=0, MaxMemory=None, Out=None, Callback=None):
     """
     Advection-Diffusion model
  
@@ -133,80 +152,272 @@ def TransportAdvecDiff(Xini, Xmax, Dx, tMax, Dt, Cco20, DiffCoef, u=0):
         Dx (float): Spatial step.
         tMax (float): Maximum time.
         Dt (float): Time step.
-        Cco20 (float): Initial CO2 concentration.
-        DiffCoef (float): Diffusion coefficient.
-        u (float): Advection velocity.
+        Cco20 (float or array): Initial CO2 concentration.
+        DiffCoef (float or array): Diffusion coefficient.
+        u (float or array): Advection velocity.
+        MaxMemory (int): Memory budget in bytes, the grid is then computed by blocks of time steps (see TransportBlocks).
+        Out (numpy.ndarray or str): Output array, or name of a .npy file written as a memory map.
+        Callback (callable): Function f(Start, TimeBlock, CBlock) called for each block of time steps.
 
     Returns:
         TimeArray (numpy.ndarray): Array of time steps.
         XArray (numpy.ndarray): Array of spatial positions.
-        CMatrix (numpy.ndarray): Computed CO2 concentration over time and space.
+        CMatrix (numpy.ndarray): Computed CO2 concentration over time and space (None if only Callback),
+                                 with the leading batch axes of the array parameters.
     """
     # Generate spatial and temporal grid
     NStepst = int(tMax/Dt) + 1
     TimeArray = np.linspace(0, tMax, NStepst)
-    TimeArray[0] = Dt # For numerical purposes, to avoid division by zero
     NStepsX = int((Xmax-Xini)/Dx) + 1
     XArray = np.linspace(Xini, Xmax, NStepsX) - Xini
 
-    # Create time and space matrices using broadcasting
-    TimeMatrix = TimeArray[:, np.newaxis]  # Shape: (NSteps, 1)
-    XMatrix = XArray[np.newaxis, :]     # Shape: (1, NStepX)
+    # Compute advection-diffusion profile by blocks of time steps
+    # (null concentration at t=0 and initial concentration at the boundary)
+    BatchShape = np.broadcast_shapes(np.shape(Cco20), np.shape(DiffCoef), np.shape(u))
+    Cco20, DiffCoef, u = BatchGrid(Cco20), BatchGrid(DiffCoef), BatchGrid(u)
+    CMatrix = TransportBlocks(TimeArray, XArray,
+                              lambda TimeMatrix, XMatrix: AdvecDiffProfile(TimeMatrix, XMatrix, Cco20, DiffCoef, u),
+                              MaxMemory, Out, Callback, BatchShape=BatchShape)
 
-    # Compute diffusion profile efficiently using NumPy broadcasting
-    term1 = np.exp(u * XMatrix / (2 * DiffCoef))
-    
-    term2 = np.exp(-XMatrix * u / (2 * DiffCoef)) * \
-            scipy.special.erfc((XMatrix / (2 * np.sqrt(DiffCoef * TimeMatrix))) - np.sqrt((u**2 * TimeMatrix) / (4 * DiffCoef)))
-    
-    term3 = np.exp(XMatrix * u / (2 * DiffCoef)) * \
-            scipy.special.erfc((XMatrix / (2 * np.sqrt(DiffCoef * TimeMatrix))) + np.sqrt((u**2 * TimeMatrix) / (4 * DiffCoef)))
+    # Get back to the original XArray
+    XArray = XArray + Xini
 
-    CMatrix = (Cco20 / 2) * term1 * (term2 + term3)
+    return TimeArray, XArray, CMatrix
 
-    # Impose that initial the initial concentration is null initially (because it's not possible to compute at t=0)
-    CMatrix[0, :] = 0
-    # Impose that the concentration at the boundaries is the initial concentration
-    CMatrix[:, 0] = Cco20
+def DiffProfile(TimeMatrix, XMatrix, Cco20, DiffCoef):
+    """
+    Concentration of the diffusion model at times and positions (from Xini) broadcast together.
+    The concentration is Cco20 at the boundary (x <= 0) and null inside at t = 0.
+    """
+    TimeMatrix = np.asarray(TimeMatrix, dtype=float)
+    XMatrix = np.asarray(XMatrix, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        CMatrix = Cco20 * scipy.special.erfc(XMatrix / (2 * np.sqrt(DiffCoef * TimeMatrix)))
+    CMatrix = np.asarray(CMatrix)
+    np.copyto(CMatrix, Cco20, where=XMatrix <= 0)
+    return CMatrix
+
+def AdvecDiffProfile(TimeMatrix, XMatrix, Cco20, DiffCoef, u=0):
+    """
+    Concentration of the advection-diffusion model at times and positions (from Xini) broadcast together.
+    The concentration is null at t <= 0 and Cco20 at the boundary (x <= 0).
+    exp(u.x/D).erfc(A+B) is computed as erfcx(A+B).exp(u.x/D - (A+B)^2), which does not overflow for large u.x/D.
+    """
+    TimeMatrix = np.asarray(TimeMatrix, dtype=float)
+    XMatrix = np.asarray(XMatrix, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        A = XMatrix / (2 * np.sqrt(DiffCoef * TimeMatrix))
+        B = np.sqrt((u**2 * TimeMatrix) / (4 * DiffCoef))
+        # Out-of-place: u, DiffCoef or Cco20 can add batch axes to the shape of A
+        CMatrix = scipy.special.erfc(A - B)
+        A = A + B
+        CMatrix = CMatrix + scipy.special.erfcx(A) * np.exp(u * XMatrix / DiffCoef - A**2)
+        CMatrix = np.asarray(CMatrix * (Cco20 / 2))
+    np.copyto(CMatrix, 0, where=TimeMatrix <= 0)
+    np.copyto(CMatrix, Cco20, where=XMatrix <= 0)
+    return CMatrix
+
+def TransportBlocks(TimeArray, XArray, Profile, MaxMemory=None, Out=None, Callback=None, NTemp=6, BatchShape=()):
+    """
+    Evaluates a concentration profile on the time x space grid by blocks of time steps, so that only the current block
+    and its temporaries are in memory.
 
-    # Get back to the original XArray and TimeArray
-    XArray = XArray + Xini
-    TimeArray[0] = 0
+    Parameters:
+        TimeArray (numpy.ndarray): Array of time steps.
+        XArray (numpy.ndarray): Array of spatial positions (from Xini).
+        Profile (callable): Function f(TimeMatrix, XMatrix) with TimeMatrix of shape (NBlock, 1) and XMatrix of shape (1, NStepsX).
+        MaxMemory (int): Memory budget in bytes of a block with its temporaries (None: one block).
+        Out (numpy.ndarray or str): Output array of shape (NStepst, NStepsX), or name of a .npy file written as a memory map.
+        Callback (callable): Function f(Start, TimeBlock, CBlock) called for each block (Start: index of its first time step).
+        NTemp (int): Number of temporaries of the size of a block used by Profile.
+        BatchShape (tuple): Leading batch axes of the output of Profile (parameters given as arrays).
 
-    return TimeArray, XArray, CMatrix
+    Returns:
+        CMatrix (numpy.ndarray): Out, a new array if neither Out nor Callback is given, else None.
+    """
+    NStepst, NStepsX = len(TimeArray), len(XArray)
+    Shape = tuple(BatchShape) + (NStepst, NStepsX)
+    if isinstance(Out, str):
+        Out = np.lib.format.open_memmap(Out, mode='w+', dtype=float, shape=Shape)
+    BNew = Out is None and Callback is None
+    NBlock = NStepst if MaxMemory is None else max(1, int(MaxMemory // (NTemp * 8 * NStepsX * math.prod(BatchShape))))
+    if BNew and NBlock < NStepst:
+        Out = np.empty(Shape)
+
+    XMatrix = XArray[np.newaxis, :]
+    for Start in range(0, NStepst, NBlock):
+        TimeBlock = TimeArray[Start:Start + NBlock]
+        CBlock = Profile(TimeBlock[:, np.newaxis], XMatrix)
+        if BNew and NBlock >= NStepst:
+            Out = CBlock
+        elif Out is not None:
+            Out[..., Start:Start + len(TimeBlock), :] = CBlock
+        if Callback is not None:
+            Callback(Start, TimeBlock, CBlock)
+
+    if isinstance(Out, np.memmap):
+        Out.flush()
+    return Out
+
+def BatchGrid(Val):
+    """ Parameter with its batch axes in front of the time and space axes of the grid."""
+    return np.reshape(Val, np.shape(Val) + (1, 1))
+
+def BatchTime(Val):
+    """ Parameter with its batch axes in front of the time axis."""
+    return np.reshape(Val, np.shape(Val) + (1,))
+
+def TransportPoints(TimePoints, XPoints, Xini, Cco20, DiffCoef, u=0):
+    """
+    Concentration of the advection-diffusion model (diffusion model if u = 0) at requested points only.
+
+    Parameters:
+        TimePoints (array): Times.
+        XPoints (array): Positions, broadcast with TimePoints (e.g. a column of times and a row of positions).
+        Xini (float): Initial position.
+        Cco20 (float or array): Initial CO2 concentration.
+        DiffCoef (float or array): Diffusion coefficient.
+        u (float or array): Advection velocity.
+
+    Returns:
+        CArray (numpy.ndarray): CO2 concentration at the points.
+    """
+    XPoints = np.asarray(XPoints, dtype=float) - Xini
+    if np.all(np.asarray(u) == 0):
+        return DiffProfile(TimePoints, XPoints, Cco20, DiffCoef)
+    return AdvecDiffProfile(TimePoints, XPoints, Cco20, DiffCoef, u)
+
+def TransportFront(TimeArray, Xini, Cco20, DiffCoef, u=0, Frac=0.5, Xmax=None, NIter=60):
+    """
+    Carbonation front: position where the CO2 concentration falls to Frac*Cco20, at each time, without the profiles
+    (bisection on all the times at once, the concentration decreasing with the position).
+
+    Parameters:
+        TimeArray (array): Times.
+        Xini (float): Initial position.
+        Cco20 (float or array): Initial CO2 concentration.
+        DiffCoef (float or array): Diffusion coefficient.
+        u (float or array): Advection velocity (arrays broadcast with TimeArray, e.g. a column of scenarios).
+        Frac (float): Fraction of Cco20 defining the front.
+        Xmax (float): Maximum position (the front is limited to it).
+        NIter (int): Number of bisections, and maximum number of doublings of the bracket of the front.
+
+    Returns:
+        XFront (numpy.ndarray): Position of the front at each time (None if the front cannot be bracketed).
+    """
+    if np.any(np.asarray(Cco20) <= 0):
+        print("Error: Cco20 must be positive.")
+        return None
+    if not 0 < Frac < 1:
+        print("Error: Frac must be between 0 and 1.")
+        return None
+
+    TimeArray = np.asarray(TimeArray, dtype=float)
+    CFront = Frac * Cco20
+    High = np.maximum(u, 0) * TimeArray + 2 * np.sqrt(DiffCoef * TimeArray) * scipy.special.erfcinv(Frac) + np.finfo(float).tiny
+    Low = np.zeros(np.shape(High))
+    for _ in range(NIter):
+        BAbove = TransportPoints(TimeArray, High, 0, Cco20, DiffCoef, u) > CFront
+        if not BAbove.any():
+            break
+        Low = np.where(BAbove, High, Low)
+        High = np.where(BAbove, 2 * High, High)
+    else:
+        if np.any(TransportPoints(TimeArray, High, 0, Cco20, DiffCoef, u) > CFront):
+            print(f"Error: Front not bracketed after {NIter} doublings.")
+            return None
+    for _ in range(NIter):
+        Mid = (Low + High) / 2
+        BAbove = TransportPoints(TimeArray, Mid, 0, Cco20, DiffCoef, u) > CFront
+        Low = np.where(BAbove, Mid, Low)
+        High = np.where(BAbove, High, Mid)
+    XFront = (Low + High) / 2 + Xini
+    if Xmax is not None:
+        XFront = np.minimum(XFront, Xmax)
+    return XFront
 
 
 # Saetta's Model
-def CarboSaettaFD(Cco2Ini, Ccaoh2Ini, tMax, Dt, RH, T):
+def CarboSaettaFD(Cco2Ini, Ccaoh2Ini, tMax, Dt, RH, T, Engine='Euler', Method='LSODA', RTol=1e-8, ATol=1e-12):
     """
     Saetta's model for the carbonation of concrete without considering diffusion.
     The partial differential equation is solved using a finite difference method.
+
+    The step-invariant factors (fh, fT) are computed once. Engines:
+    - 'Euler': explicit Euler scheme with the time step Dt, still a Python loop over the time steps: it is not faster than
+      before for a single scenario. Cco2Ini, Ccaoh2Ini, RH and T can be arrays (batch of scenarios, integrated together
+      in the same loop), the concentrations then have the batch axes in front of time.
+    - 'ODE': scipy.integrate.solve_ivp with an adaptive method (Method: 'LSODA' switches between stiff and non-stiff, or
+      'RK45', 'BDF'...), evaluated on TimeArray. Array parameters are integrated scenario by scenario.
+      Returns None if an integration fails.
     """
     # Constants
     MCaOH2 = 74.093  # g/mol
     MCO2 = 44.01  # g/mol
     MCaCO3 = 100.086  # g/mol
+    Alpha1 = 2.8*10**(-7)
+    m = 1
     
     NSteps = int(tMax/Dt) + 1
     TimeArray = np.linspace(0, tMax, NSteps)
-    CCo2Array = np.zeros(NSteps)
-    CCaOH2Array = np.zeros(NSteps)
-    CCaCO3Array = np.zeros(NSteps)
+
+    # Step-invariant factors: Rate = K * fCo2 * fCaOH2
+    K = Alpha1*SaettaFh(RH)*SaettaFT(T)
+    BatchShape = np.broadcast_shapes(np.shape(Cco2Ini), np.shape(Ccaoh2Ini), np.shape(K))
+    K, Cco2Ini, Ccaoh2Ini = [np.broadcast_to(Val, BatchShape).astype(float) for Val in (K, Cco2Ini, Ccaoh2Ini)]
+
+    if Engine == 'ODE':
+        CCaOH2Array, CCo2Array, CCaCO3Array = [np.zeros(BatchShape + (NSteps,)) for _ in range(3)]
+        for Index in np.ndindex(BatchShape):
+            KVal, Cco2Val, Ccaoh2Val = K[Index], Cco2Ini[Index], Ccaoh2Ini[Index]
+
+            def Derivative(t, Y):
+                Rate = KVal * Y[0]/Cco2Val * (1-(1-Y[1]/Ccaoh2Val)**m) * Ccaoh2Val
+                return [-Rate / MCaOH2 * MCO2, -Rate, Rate / MCaOH2 * MCaCO3]
+
+            Solution = solve_ivp(Derivative, (0, TimeArray[-1]), [Cco2Val, Ccaoh2Val, 0], method=Method, t_eval=TimeArray,
+                                 rtol=RTol, atol=ATol)
+            if not Solution.success:
+                print(f"Error: The integration of the scenario {Index} failed: {Solution.message}")
+                return None
+            CCo2Array[Index], CCaOH2Array[Index], CCaCO3Array[Index] = Solution.y
+        return TimeArray, CCaOH2Array, CCo2Array, CCaCO3Array
+    elif Engine != 'Euler':
+        print(f"Error: Unknown engine {Engine}.")
+        return None
+
+    # Time steps along the first axis, scenarios along the others
+    CCo2Array = np.zeros((NSteps,) + BatchShape)
+    CCaOH2Array = np.zeros((NSteps,) + BatchShape)
+    CCaCO3Array = np.zeros((NSteps,) + BatchShape)
     
     # Initial conditions
     CCo2Array[0] = Cco2Ini
     CCaOH2Array[0] = Ccaoh2Ini
     CCaCO3Array[0] = 0
+
+    # Increments per unit of rate
+    DCo2 = Dt * Ccaoh2Ini / MCaOH2 * MCO2
+    DCaOH2 = Dt * Ccaoh2Ini
+    DCaCO3 = Dt * Ccaoh2Ini / MCaOH2 * MCaCO3
     
     # Time-stepping loop
     for i in range(1, NSteps):
-        Rate = CarboSaettaRate(CCaOH2Array[i-1], CCo2Array[i-1], Cco2Ini, Ccaoh2Ini, RH, T)
+        Rate = K * CCo2Array[i-1]/Cco2Ini * (1-(1-CCaOH2Array[i-1]/Ccaoh2Ini)**m)
         
-        CCo2Array[i] = CCo2Array[i-1] - Dt * Rate * Ccaoh2Ini / MCaOH2 * MCO2
-        CCaOH2Array[i] = CCaOH2Array[i-1] - Dt * Rate * Ccaoh2Ini
-        CCaCO3Array[i] = CCaCO3Array[i-1] + Dt * Rate * Ccaoh2Ini / MCaOH2 * MCaCO3
+        CCo2Array[i] = CCo2Array[i-1] - Rate * DCo2
+        CCaOH2Array[i] = CCaOH2Array[i-1] - Rate * DCaOH2
+        CCaCO3Array[i] = CCaCO3Array[i-1] + Rate * DCaCO3
 
-    return TimeArray, CCaOH2Array, CCo2Array, CCaCO3Array
+    return TimeArray, np.moveaxis(CCaOH2Array, 0, -1), np.moveaxis(CCo2Array, 0, -1), np.moveaxis(CCaCO3Array, 0, -1)
+
+def SaettaFh(RH):
+    """ Humidity factor of Saetta's model (0 under RH = 0.5, 1 over RH = 0.9, linear between)."""
+    return np.clip(5/2*(np.asarray(RH, dtype=float) - 0.5), 0, 1)
+
+def SaettaFT(T, E0=48096, R=8.314, T0=296):
+    """ Temperature factor of Saetta's model (Arrhenius law)."""
+    return np.exp(E0/R*(1/T0-1/np.asarray(T, dtype=float)))
 
 def CarboSaettaRate(CCaOH2, CCo2, Cco2Ini, Ccaoh2Ini, RH, T):
     # Constants
@@ -216,15 +427,10 @@ def CarboSaettaRate(CCaOH2, CCo2, Cco2Ini, Ccaoh2Ini, RH, T):
     R = 8.314
     T0 = 296
 
-    if RH <= 0.5:
-        fh = 0
-    elif RH > 0.5 and RH <= 0.9:
-        fh = 5/2*(RH - 0.5)
-    else:
-        fh = 1
+    fh = SaettaFh(RH)
     fCo2 = CCo2/Cco2Ini
     fCaOH2 = 1-(1-CCaOH2/Ccaoh2Ini)**m
-    fT = np.exp(E0/R*(1/T0-1/T))
+    fT = SaettaFT(T, E0, R, T0)
     
     ReactionRate = Alpha1*fh*fCo2*fCaOH2*fT
     return ReactionRate
@@ -295,6 +501,7 @@ def CarboSaettaAnal(Cco2Ini, Ccaoh2Ini, tMax, Dt, RH, T):
     """
     Saetta's model for the carbonation of concrete without considering diffusion.
     The partial differential equation is solved analytically with the help of Wolfram Alpha.
+    Cco2Ini, Ccaoh2Ini, RH and T can be arrays (batch of scenarios), the concentrations then have the batch axes in front of time.
     """
     # Chemicals Constants
     MCaOH2 = 74.093 # g/mol 
@@ -309,20 +516,15 @@ def CarboSaettaAnal(Cco2Ini, Ccaoh2Ini, tMax, Dt, RH, T):
     T0 = 296
 
     # Model Variables Determination
-    if RH <= 0.5:
-        fh = 0
-    elif RH > 0.5 and RH <= 0.9:
-        fh = 5/2*(RH - 0.5)
-    else:
-        fh = 1
-    fT = np.exp(E0/R*(1/T0-1/T))
+    fh = SaettaFh(RH)
+    fT = SaettaFT(T, E0, R, T0)
 
     # Determined Model Variables
-    Gamma2 = (Ccaoh2Ini*Alpha1*fh*fT)/(Cco2Ini*Ccaoh2Ini)
+    Gamma2 = BatchTime((Ccaoh2Ini*Alpha1*fh*fT)/(Cco2Ini*Ccaoh2Ini))
 
     # Defining Initial Conditions
-    X0 = Cco2Ini  # Initial concentration of CO2
-    Y0 = Ccaoh2Ini  # Initial concentration of Ca(OH)2
+    X0 = BatchTime(Cco2Ini)  # Initial concentration of CO2
+    Y0 = BatchTime(Ccaoh2Ini)  # Initial concentration of Ca(OH)2
     Z0 = 0  # Initial concentration of CaCO3
 
     # Defining Gamma values for the equations
@@ -334,22 +536,132 @@ def CarboSaettaAnal(Cco2Ini, Ccaoh2Ini, tMax, Dt, RH, T):
     tVect = np.linspace(0, tMax, int(tMax/Dt) + 1)
 
     # From Wolfram Alpha
-    ## Compute x(t) CO2
-    NumeratorY = np.exp(Gamma3*tVect*Y0) * Y0 * (-Gamma4*X0+Gamma3*Y0)
-    DenominatorY = -np.exp(Gamma4*tVect*X0) * Gamma4 * X0 + np.exp(Gamma3*tVect*Y0) * Gamma3 * Y0
+    # (numerator and denominator divided by exp(Gamma3*t*Y0): one exponential, which does not overflow in the ratio)
+    ## Compute y(t) Ca(OH)2
+    NumeratorY = Y0 * (-Gamma4*X0+Gamma3*Y0)
+    DenominatorY = -np.exp((Gamma4*X0-Gamma3*Y0)*tVect) * Gamma4 * X0 + Gamma3 * Y0
     Y = NumeratorY/DenominatorY
-    Cco2Vals = X0 + Gamma3/Gamma4 * (Y-Y0)
+    Ccaoh2Vals = Y
 
-    # Compute y(t) Ca(OH)2
-    NumeratorY = np.exp(Gamma3*tVect*Y0) * Y0 * (-Gamma4*X0+Gamma3*Y0)
-    DenominatorY = -np.exp(Gamma4*tVect*X0) * Gamma4 * X0 + np.exp(Gamma3*tVect*Y0) * Gamma3 * Y0
-    Ccaoh2Vals = NumeratorY/DenominatorY
+    # Compute x(t) CO2
+    Cco2Vals = X0 + Gamma3/Gamma4 * (Y-Y0)
 
     # Compute z(t) CaCO3
     Ccaco3Vals = Z0 - Gamma5/Gamma4 * (Y-Y0)
 
     return tVect, Ccaoh2Vals, Cco2Vals, Ccaco3Vals
 
+# Diffusion-reaction model
+def CarboDiffReact(Xini, Xmax, Dx, tMax, Dt, Cco20, Ccaoh2Ini, DiffCoef, RH, T, DtStep=None, Theta=1, NIter=2,
+                   BAdaptive=True, Tol=1e-3, DtMax=None):
+    """
+    Coupled diffusion of CO2 and consumption of Ca(OH)2 (Saetta's reaction rate) in 1D, on a finite volume grid.
+    The CO2 concentration is Cco20 at Xini and the flux is null at Xmax, the concrete is initially free of CO2.
+
+    The reaction is fast compared to the diffusion (sharp carbonation front), so it is implicit and solved together with
+    the diffusion: each step solves the tridiagonal system of the CO2 (theta scheme for the diffusion, 1: implicit,
+    0.5: Crank-Nicolson, implicit sink b.c.CaOH2.CO2) with scipy.linalg.solve_banded, then CaOH2 = CaOH2 / (1 + Dt.b.CO2),
+    NIter times (Picard iterations). A step costs O(NStepsX).
+    With BAdaptive, each step is compared with two half steps: the step size is halved when the difference (root mean
+    square, relative to Cco20 and Ccaoh2Ini) exceeds Tol and doubled when it is under Tol/4.
+
+    Parameters:
+        Xini (float): Initial position.
+        Xmax (float): Maximum position.
+        Dx (float): Spatial step.
+        tMax (float): Maximum time.
+        Dt (float): Time step of the outputs.
+        Cco20 (float): CO2 concentration at the surface.
+        Ccaoh2Ini (float): Initial Ca(OH)2 concentration.
+        DiffCoef (float): Diffusion coefficient of CO2.
+        RH (float): Relative humidity (-).
+        T (float): Temperature (K).
+        DtStep (float): Initial (or fixed without BAdaptive) step size, Dt by default.
+        Theta (float): Implicitness of the diffusion.
+        NIter (int): Number of Picard iterations per step.
+        BAdaptive (bool): If True, the step size is adapted.
+        Tol (float): Tolerance of the adaptive steps.
+        DtMax (float): Largest step size, Dt by default.
+
+    Returns:
+        TimeArray (numpy.ndarray): Array of time steps.
+        XArray (numpy.ndarray): Array of spatial positions.
+        CCo2Matrix, CCaOH2Matrix, CCaCO3Matrix (numpy.ndarray): Concentrations over time and space.
+    """
+    # Constants
+    MCaOH2 = 74.093  # g/mol
+    MCO2 = 44.01  # g/mol
+    MCaCO3 = 100.086  # g/mol
+    Alpha1 = 2.8*10**(-7)
+
+    # Grid
+    NStepst = int(tMax/Dt) + 1
+    TimeArray = np.linspace(0, tMax, NStepst)
+    NStepsX = int((Xmax-Xini)/Dx) + 1
+    XArray = np.linspace(Xini, Xmax, NStepsX)
+    Dx = XArray[1] - XArray[0]
+    DtStep = Dt if DtStep is None else DtStep
+    DtMax = Dt if DtMax is None else DtMax
+    DtMin = DtStep*1e-9
+
+    # Reaction: dCaOH2/dt = -b.CO2.CaOH2 and dCO2/dt = -b.c.CO2.CaOH2
+    b = Alpha1*SaettaFh(RH)*SaettaFT(T)/Cco20
+    c = MCO2/MCaOH2
+
+    # Diffusion of the free nodes (1 to NStepsX-1), with the surface value and a null flux at Xmax (mirror node)
+    Coef = DiffCoef/Dx**2
+    Lower = np.ones(NStepsX-1)
+    Lower[-2] = 2
+
+    def Step(State, h):
+        CCo2, CCaOH2, CCaCO3 = State
+        Free = CCo2[1:]
+        Lap = np.empty_like(Free)
+        Lap[0] = CCo2[0] - 2*Free[0] + Free[1]
+        Lap[1:-1] = Free[:-2] - 2*Free[1:-1] + Free[2:]
+        Lap[-1] = 2*(Free[-2] - Free[-1])
+        Rhs = Free + (1-Theta)*h*Coef*Lap
+        Rhs[0] += Theta*h*Coef*Cco20
+
+        Bands = np.empty((3, NStepsX-1))
+        Bands[0] = -Theta*h*Coef
+        Bands[2] = -Theta*h*Coef*Lower
+        CCaOH2New = CCaOH2
+        for _ in range(NIter):
+            Bands[1] = 1 + 2*Theta*h*Coef + h*b*c*CCaOH2New[1:]
+            CCo2New = np.concatenate(([Cco20], scipy.linalg.solve_banded((1, 1), Bands, Rhs, check_finite=False)))
+            CCaOH2New = CCaOH2/(1 + h*b*CCo2New)
+        return CCo2New, CCaOH2New, CCaCO3 + (CCaOH2 - CCaOH2New)*MCaCO3/MCaOH2
+
+    CCo2Matrix = np.zeros((NStepst, NStepsX))
+    CCaOH2Matrix = np.zeros((NStepst, NStepsX))
+    CCaCO3Matrix = np.zeros((NStepst, NStepsX))
+    State = (np.zeros(NStepsX), np.full(NStepsX, float(Ccaoh2Ini)), np.zeros(NStepsX))
+    State[0][0] = Cco20
+    CCo2Matrix[0], CCaOH2Matrix[0], CCaCO3Matrix[0] = State
+
+    # Time-stepping loop, landing on the output times
+    t = 0
+    h = DtStep
+    for i in range(1, NStepst):
+        while t < TimeArray[i]:
+            StepSize = min(h, TimeArray[i] - t)
+            New = Step(State, StepSize)
+            if BAdaptive:
+                Half = Step(Step(State, StepSize/2), StepSize/2)
+                Error = max(np.sqrt(np.mean((New[0] - Half[0])**2))/Cco20, np.sqrt(np.mean((New[1] - Half[1])**2))/Ccaoh2Ini)
+                if Error > Tol and StepSize > DtMin:
+                    h = StepSize/2
+                    continue
+                New = Half
+                if Error < Tol/4 and StepSize == h:
+                    h = min(2*h, DtMax)
+            State = New
+            t = TimeArray[i] if StepSize == TimeArray[i] - t else t + StepSize
+        CCo2Matrix[i], CCaOH2Matrix[i], CCaCO3Matrix[i] = State
+
+    return TimeArray, XArray, CCo2Matrix, CCaOH2Matrix, CCaCO3Matrix
+
 # Simplified Carbonation Model
 def CarboSilva(SigmaCO2, RH, RhoClincker, fc, ExpositionClass=1, tMax=5, Dt=0.1):
     """
@@ -360,7 +672,7 @@ def CarboSilva(SigmaCO2, RH, RhoClincker, fc, ExpositionClass=1, tMax=5, Dt=0.1)
         SigmaCO2: float
             Volumic concentration of CO2 in the air (m^3/m^3).
         RH: float
-            Relative humidity of the air (%).
+            Relative humidity of the air (%). Dry environment up to 70 %, wet environment above.
         RhoClincker: float
             Massic concentration of clinker in the concrete (kg/m^3).
         fc: float
@@ -371,15 +683,14 @@ def CarboSilva(SigmaCO2, RH, RhoClincker, fc, ExpositionClass=1, tMax=5, Dt=0.1)
             Maximum time for the simulation (years).
         Dt: float
             Time step for the simulation (years).
+    The inputs can be arrays (batch of scenarios), xc then has the batch axes in front of time.
     """
     tVect = np.linspace(0, tMax, int(tMax/Dt) + 1)
 
-    if 0 <= RH <= 70:  # Dry environment
-        kd = 0.556*SigmaCO2 - 3.602*ExpositionClass - 0.148*fc + 18.734
-        xc = kd*tVect**0.5  # [mm]
-    elif 70 <= RH <= 10:  # Wet environment
-        kw = 3.355*SigmaCO2 - 0.019*RhoClincker - 0.042*fc + 10.830  # Wet environment
-        xc = kw*tVect**0.5  # [mm]
+    kd = 0.556*SigmaCO2 - 3.602*ExpositionClass - 0.148*fc + 18.734  # Dry environment
+    kw = 3.355*SigmaCO2 - 0.019*RhoClincker - 0.042*fc + 10.830  # Wet environment
+    k = np.where(np.asarray(RH) <= 70, kd, kw)
+    xc = BatchTime(k)*tVect**0.5  # [mm]
 
     return tVect, xc
 
@@ -402,13 +713,14 @@ def CarboPetreLazar(Gamma, RH, fc, tMax=5, Dt=0.1):
             Maximum time for the simulation (years).
         Dt: float
             Time step for the simulation (years).
-
+    The inputs can be arrays (batch of scenarios), xc then has the batch axes in front of time.
     """
     tVect = np.linspace(0, tMax, int(tMax/Dt) + 1)
     
+    RH, fc = np.asarray(RH, dtype=float), np.asarray(fc, dtype=float)
     fRH = -3.5833*(RH/100)**2 + 3.4833*(RH/100) + 0.2
     k = 365**0.5 * (1/(2.1*fc**0.5)-0.06)
-    xc = 10 * Gamma * fRH * k * tVect**0.5  # [mm]
+    xc = 10 * BatchTime(Gamma * fRH * k) * tVect**0.5  # [mm]
 
     return tVect, xc
 
@@ -440,6 +752,137 @@ def CarboHyvert():
     """
     pass
     
+# Parameter sweep
+"""
+SweepCube
+
+Result of a parameter sweep: one labelled axis per swept parameter, then an axis for the outputs of the model when it
+has several, then the time (and space) axes.
+"""
+class SweepCube:
+    def __init__(self, Dims, Coords, Values):
+        self.Dims = Dims  # Names of the axes
+        self.Coords = Coords  # {Name: labels of the axis}
+        self.Values = Values
+
+    def Sel(self, **Labels):
+        """
+        Selects by labels (closest label for the numerical axes).
+
+        Args:
+            Labels: {Name of an axis: label}
+
+        Returns:
+            SweepCube (or numpy.ndarray / float if all the axes are selected).
+        """
+        Index = []
+        Dims = []
+        for Dim in self.Dims:
+            if Dim in Labels:
+                Coord = np.asarray(self.Coords[Dim])
+                if Coord.dtype.kind in 'fiu':
+                    Index.append(int(np.argmin(np.abs(Coord - Labels[Dim]))))
+                else:
+                    Index.append(list(Coord).index(Labels[Dim]))
+            else:
+                Index.append(slice(None))
+                Dims.append(Dim)
+        Values = self.Values[tuple(Index)]
+        if not Dims:
+            return Values
+        return SweepCube(Dims, {Dim: self.Coords[Dim] for Dim in Dims}, Values)
+
+    @property
+    def shape(self):
+        return self.Values.shape
+
+# Models of the sweep: function, names of the coordinate outputs, names of the value outputs,
+# names of the arguments accepting arrays (the arguments that can be swept)
+SweepModels = {
+    'TransportDiff': (TransportDiff, ['Time', 'X'], ['CCO2'], ['Cco20', 'DiffCoef']),
+    'TransportAdvecDiff': (TransportAdvecDiff, ['Time', 'X'], ['CCO2'], ['Cco20', 'DiffCoef', 'u']),
+    'CarboSaettaAnal': (CarboSaettaAnal, ['Time'], ['CaOH2', 'CO2', 'CaCO3'], ['Cco2Ini', 'Ccaoh2Ini', 'RH', 'T']),
+    'CarboSilva': (CarboSilva, ['Time'], ['xc'], ['SigmaCO2', 'RH', 'RhoClincker', 'fc', 'ExpositionClass']),
+    'CarboPetreLazar': (CarboPetreLazar, ['Time'], ['xc'], ['Gamma', 'RH', 'fc']),
+}
+
+def SweepChunk(Model, Fixed, Chunk):
+    """ Evaluates a model on a chunk of scenarios in one broadcasted pass (worker of CarboSweep)."""
+    Function, CoordNames, _, _ = SweepModels[Model]
+    Outputs = Function(**Fixed, **Chunk)
+    return Outputs[:len(CoordNames)], np.stack(Outputs[len(CoordNames):], axis=1)
+
+def CarboSweep(Model, Params, NWorkers=1, ChunkSize=None, **Fixed):
+    """
+    Parameter sweep of a carbonation model: all the combinations of the values of the parameters are evaluated with a
+    leading batch axis in one broadcasted pass per chunk of scenarios, the chunks being spread over a process pool.
+
+    Args:
+        Model (str): Name of the model ('TransportDiff', 'TransportAdvecDiff', 'CarboSaettaAnal', 'CarboSilva', 'CarboPetreLazar').
+        Params (dict): {Name of an argument of the model accepting arrays: values}, swept on the grid of all the combinations.
+        NWorkers (int): Number of processes (1: in the current process).
+        ChunkSize (int): Number of scenarios per chunk (None: one chunk per worker).
+        Fixed: Other arguments of the model.
+
+    Returns:
+        SweepCube: Values with the axes of the parameters (in the order of Params), 'Output' if the model has several,
+                   then the coordinate axes (e.g. 'Time', 'X').
+
+    Example (RH starts above 0.5: the humidity factor of Saetta is 0 up to RH = 0.5, where the analytic solution is 0/0):
+        Cube = CarboSweep('CarboSaettaAnal', {'RH': np.linspace(0.55, 1, 46), 'T': [283, 293, 303]},
+                          Cco2Ini=0.04, Ccaoh2Ini=80, tMax=100, Dt=1)
+        Cube.Sel(RH=0.7, T=293, Output='CO2')
+    """
+    if Model not in SweepModels:
+        print(f"Error: Unknown model {Model}.")
+        return None
+    Function, CoordNames, OutputNames, BatchNames = SweepModels[Model]
+
+    # Arguments of the model, checked here rather than in the worker processes
+    for Name in Params:
+        if Name not in BatchNames:
+            print(f"Error: {Name} cannot be swept with {Model}, the swept arguments are {', '.join(BatchNames)}.")
+            return None
+        if Name in Fixed:
+            print(f"Error: {Name} is both swept and fixed.")
+            return None
+    try:
+        inspect.signature(Function).bind(**Fixed, **Params)
+    except TypeError as e:
+        print(f"Error: Arguments of {Model}: {e}.")
+        return None
+
+    # Flattened grid of the scenarios
+    Names = list(Params)
+    Labels = [np.asarray(Params[Name]) for Name in Names]
+    Sizes = [len(Label) for Label in Labels]
+    Grid = np.meshgrid(*Labels, indexing='ij')
+    Flat = {Name: Val.reshape(-1) for Name, Val in zip(Names, Grid)}
+    NScenario = math.prod(Sizes)
+
+    if ChunkSize is None:
+        ChunkSize = -(-NScenario // max(NWorkers, 1))
+    Chunks = [{Name: Val[Start:Start + ChunkSize] for Name, Val in Flat.items()} for Start in range(0, NScenario, ChunkSize)]
+
+    if NWorkers == 1 or len(Chunks) == 1:
+        Results = [SweepChunk(Model, Fixed, Chunk) for Chunk in Chunks]
+    else:
+        with ProcessPoolExecutor(NWorkers) as Pool:
+            Results = list(Pool.map(SweepChunk, [Model]*len(Chunks), [Fixed]*len(Chunks), Chunks))
+
+    Coords, _ = Results[0]
+    Values = np.concatenate([Value for _, Value in Results], axis=0)
+    Values = Values.reshape(Sizes + list(Values.shape[1:]))
+    Dims = Names + ['Output'] + CoordNames
+    CoordDict = dict(zip(Names, Labels))
+    CoordDict['Output'] = OutputNames
+    CoordDict.update(zip(CoordNames, Coords))
+    if len(OutputNames) == 1:
+        Values = Values[(slice(None),)*len(Names) + (0,)]
+        Dims.remove('Output')
+        del CoordDict['Output']
+    return SweepCube(Dims, CoordDict, Values)
+
 
 # Hydration Degree
 def  HydrationDegree(ECRatio, BPrint=True):
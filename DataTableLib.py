@@ -0,0 +1,2305 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 18 14:02:47 2026
+
+@author: Thommes Eliott
+"""
+
+# Library of the tabular data shared by DataLag (LagamineLib) and DataRecord (DataStorageLib)
+
+# Other Lib
+import os
+import json
+import hashlib
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+import pandas as pd
+
+# Custom Lib
+
+
+"""
+F71Parser
+
+Vectorized parser of the Lagamine .f71 result files.
+A group is made of the numeric values found between two non-numeric lines,
+the numeric values of a non-numeric line starting the next group.
+The bytes are classified once by bytes.translate, the lines holding a character that cannot be part of a number
+are the non-numeric lines and only their tokens are examined one by one. The non-numeric tokens are blanked
+and all the numbers of a block are converted at once by np.fromstring. Blocks with unusual tokens (nan, inf, 1_000,
+malformed numbers) are handed over to the line by line parser so that the groups are always the same as the original parser.
+"""
+# Classes of the bytes used by the F71Parser (translation table of bytes.translate):
+# 0 whitespace, 1 digit, 2 character of a number that cannot end it (sign, dot, exponent), 3 character that cannot be part of a number
+F71Class = bytes(0 if Byte in b' \t\n\x0b\x0c' else 1 if Byte in b'0123456789' else 2 if Byte in b'+-.eE' else 3
+                 for Byte in range(256))
+F71Suspicious = np.zeros(256, dtype=bool)  # First letters of the tokens float() may accept (nan, inf, infinity)
+F71Suspicious[list(b'nNiI')] = True
+
+class F71Parser:
+    def __init__(self):
+        # Values of the group being captured (list of arrays)
+        self.Parts = []
+        # Tokens containing letters already checked by float() (True if float() accepts them)
+        self.TokenMemo = {}
+
+    def CloseGroup(self):
+        """
+        Returns the group being captured as a single array and starts a new one.
+        """
+        if not self.Parts:
+            return None
+        Group = self.Parts[0] if len(self.Parts) == 1 else np.concatenate(self.Parts)
+        self.Parts = []
+        return Group
+
+    def Feed(self, Data):
+        """
+        Parses a block of complete lines and returns the groups closed inside the block.
+        The group still being captured at the end of the block is kept for the next call.
+
+        Args:
+            Data (bytes): Block of lines of the file.
+
+        Returns:
+            Groups (list): List of 1D float arrays, one per closed group.
+        """
+        if not Data:
+            return []
+
+        # Universal newlines, as the text mode of open(), and a newline at the end of the last line
+        if b'\r' in Data:
+            Data = Data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        if not Data.endswith(b'\n'):
+            Data += b'\n'
+
+        # Tokens of the block, found where the bytes change from whitespace to text and back
+        ByteArray = np.frombuffer(Data, dtype=np.uint8)
+        Class = np.frombuffer(Data.translate(F71Class), dtype=np.uint8)
+        BText = Class != 0
+        Edges = np.flatnonzero(BText[1:] != BText[:-1]) + 1
+        if BText[0]:
+            Edges = np.concatenate(([0], Edges))
+        TokPos = Edges[0::2]
+        TokLast = Edges[1::2] - 1
+        if TokPos.size == 0:
+            return []
+
+        # A plain number ends with a digit, or with a dot following a digit (e.g. '1.'), separators such as '---' are not numbers
+        # (the byte before a token starting the block is the final newline)
+        BBad = Class == 3
+        EndPos = TokLast[Class[TokLast] == 2]
+        BBad[EndPos[(ByteArray[EndPos] != ord('.')) | (Class[EndPos - 1] != 1)]] = True
+
+        # Non-numeric lines are the lines holding a character that cannot be part of a number
+        LineEnd = np.flatnonzero(ByteArray == ord('\n'))
+        LineStart = np.concatenate(([0], LineEnd[:-1] + 1))
+        BadLine = np.flatnonzero(np.logical_or.reduceat(BBad, LineStart))
+
+        CleanData = Data
+        Bounds = []
+        NBadTok = 0
+        if BadLine.size:
+            # Tokens of the non-numeric lines
+            FirstTok = np.searchsorted(TokPos, LineStart[BadLine])
+            NLineTok = np.searchsorted(TokPos, LineEnd[BadLine]) - FirstTok
+            LineOffset = np.cumsum(NLineTok) - NLineTok
+            LineTok = np.repeat(FirstTok - LineOffset, NLineTok) + np.arange(NLineTok.sum())
+
+            # Non-numeric tokens (only whitespace and numeric lines lie between a token and the next one of a non-numeric line)
+            BBadTok = np.logical_or.reduceat(BBad, TokPos[LineTok])
+            BadTok = LineTok[BBadTok]
+            BadStart = TokPos[BadTok]
+            BadLen = TokLast[BadTok] - BadStart + 1
+            NBadTok = BadTok.size
+
+            # Tokens with letters that float() would still accept (nan, inf, 1_000) must go through the line parser
+            FirstChar = ByteArray[BadStart]
+            SecondChar = ByteArray[BadStart + 1]
+            BSign = (FirstChar == ord('+')) | (FirstChar == ord('-'))
+            BCheck = np.where(BSign, F71Suspicious[SecondChar], F71Suspicious[FirstChar])
+            if b'_' in Data:
+                BCheck[np.searchsorted(BadStart, np.flatnonzero(ByteArray == ord('_')), side='right') - 1] = True
+            for TokIndex in np.flatnonzero(BCheck):
+                Token = Data[BadStart[TokIndex]:BadStart[TokIndex] + BadLen[TokIndex]]
+                if Token not in self.TokenMemo:
+                    try:
+                        float(Token)
+                        self.TokenMemo[Token] = True
+                    except ValueError:
+                        self.TokenMemo[Token] = False
+                if self.TokenMemo[Token]:
+                    return self.FeedLines(Data)
+
+            # Index of the first value of every non-numeric line
+            BadCum = np.zeros(LineTok.size + 1, dtype=np.int64)
+            np.cumsum(BBadTok, out=BadCum[1:])
+            Bounds = (FirstTok - BadCum[LineOffset]).tolist()
+
+            # Blank the non-numeric tokens
+            BadOffset = np.cumsum(BadLen) - BadLen
+            CleanArray = ByteArray.copy()
+            CleanArray[np.repeat(BadStart - BadOffset, BadLen) + np.arange(BadLen.sum())] = ord(' ')
+            CleanData = CleanArray.tobytes()
+
+        # Convert all the numbers at once (np.fromstring reads a blank string as [-1.])
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', DeprecationWarning)
+                Values = np.fromstring(CleanData, dtype=np.float64, sep=' ') if TokPos.size > NBadTok else np.zeros(0)
+        except (ValueError, DeprecationWarning):
+            return self.FeedLines(Data)
+        if Values.size != TokPos.size - NBadTok:
+            # Tokens such as 1-2 or 1.2.3 are split by np.fromstring
+            return self.FeedLines(Data)
+
+        # Split the values at every non-numeric line
+        Head = Values[:Bounds[0]] if Bounds else Values
+        if Head.size:
+            self.Parts.append(Head)
+        if not Bounds:
+            return []
+        Groups = []
+        Group = self.CloseGroup()
+        if Group is not None:
+            Groups.append(Group)
+        Groups.extend([Values[Start:End] for Start, End in zip(Bounds[:-1], Bounds[1:]) if End > Start])
+        if Bounds[-1] < Values.size:
+            self.Parts = [Values[Bounds[-1]:]]
+        return Groups
+
+    def FeedLines(self, Data):
+        """
+        Line by line parser of a block of complete lines (reference behaviour of the .f71 reader).
+
+        Args:
+            Data (bytes): Block of lines of the file.
+
+        Returns:
+            Groups (list): List of 1D float arrays, one per closed group.
+        """
+        Groups = []
+        for line in Data.splitlines():
+            line = line.strip() # Remove leading/trailing whitespace
+            if not line:
+                continue  # Skip empty lines
+            try:
+                # Attempt to parse floats from line
+                self.Parts.append(np.array([float(Val) for Val in line.split()]))
+            except ValueError:
+                # Line is not numeric, the current group is closed
+                Group = self.CloseGroup()
+                if Group is not None:
+                    Groups.append(Group)
+                # The numeric values of the non-numeric line start the next group
+                Values = []
+                for val in line.split():
+                    try:
+                        Values.append(float(val))
+                    except ValueError:
+                        continue
+                if Values:
+                    self.Parts = [np.array(Values)]
+        return Groups
+
+    def Flush(self):
+        """
+        Closes the group still being captured at the end of the file.
+
+        Returns:
+            Groups (list): List with the last group, empty if there is none.
+        """
+        Group = self.CloseGroup()
+        return [] if Group is None else [Group]
+
+def ReadF71(FileName, ChunkSize=2**24):
+    """
+    Reads a Lagamine .f71 file by blocks of lines with the F71Parser.
+
+    Args:
+        FileName (str): Path of the file.
+        ChunkSize (int): Approximate size of the blocks in bytes.
+
+    Returns:
+        DataRows (list): List of 1D float arrays, one per group.
+    """
+    Parser = F71Parser()
+    DataRows = []
+    with open(FileName, 'rb') as file:
+        while True:
+            Chunk = file.read(ChunkSize)
+            if not Chunk:
+                break
+            # Complete the last line of the block
+            Chunk += file.readline()
+            DataRows.extend(Parser.Feed(Chunk))
+    DataRows.extend(Parser.Flush())
+    return DataRows
+
+def ReadF71Lines(FileName):
+    """
+    Reads a Lagamine .f71 file line by line (reference parser of the .f71 files).
+
+    Args:
+        FileName (str): Path of the file.
+
+    Returns:
+        DataRows (list): List of lists of floats, one per group.
+    """
+    with open(FileName, 'r') as file:
+        lines = file.readlines()
+
+    DataRows, CurrentGroup = [], []
+    Capturing = False # Flag to indicate if we are capturing data (Initially not capturing data)
+    for line in lines:
+        line = line.strip() # Remove leading/trailing whitespace
+        if not line: 
+            continue  # Skip empty lines
+        try:
+            # Attempt to parse floats from line
+            Values = [float(Val) for Val in line.split()]
+            if not Capturing: # If have finished loading data then create a new current group
+                CurrentGroup = []
+                Capturing = True
+            CurrentGroup.extend(Values) # Add the values to the current group
+        except ValueError:
+            # Line is not numeric
+            if Capturing: # If we are capturing data and encouter a new group
+                if CurrentGroup:
+                    DataRows.append(CurrentGroup)
+                    CurrentGroup = []
+                Capturing = False
+            # If there are data after the non-numeric line, we need to add them to the current group. If not, we can skip the line.
+            # Try to extract any numeric values from the non-numeric line
+            Values = []
+            for val in line.split():
+                try:
+                    Values.append(float(val))
+                except ValueError:
+                    continue
+            if Values:
+                if not Capturing: # If have finished loading data then create a new current group
+                    CurrentGroup = []
+                    Capturing = True
+                CurrentGroup.extend(Values)
+    # Append last group if still capturing
+    if CurrentGroup:
+        DataRows.append(CurrentGroup)          
+    return DataRows
+
+
+"""
+File formats
+
+Registry of the readers of the data files. Each format is given by:
+- Extensions: end of the names of its files (case insensitive),
+- Read: function reading the whole file, Read(FileName, **ReadArgs) -> Data (list of rows or matrix),
+- ReadChunks: generator reading the file by blocks of rows, ReadChunks(FileName, Rows, **ReadArgs) -> matrices,
+- Sniff: function telling from the first bytes of a file if it has the format (names with an unknown extension).
+  Only the formats with a magic number have one (HDF5, Parquet, Excel): the text formats (.csv/.txt, .ipe/.ipn, .f71)
+  cannot be told apart from their first bytes and the DAE files have no fixed header, they are recognized by their extension only.
+The readers ignore the arguments they do not use (Engine, Cols...).
+The libraries needed by a reader are imported inside its functions, only when the format is used.
+"""
+FileFormats = {}
+
+def RegisterFileFormat(Name, Extensions, Read, ReadChunks=None, Sniff=None):
+    """
+    Adds a file format to the registry (or replaces the format of the same name).
+
+    Args:
+        Name (str): Name of the format.
+        Extensions (tuple): End of the names of the files, e.g. ('.csv', '.txt').
+        Read (callable): Reader of the whole file.
+        ReadChunks (callable): Reader of the file by blocks of rows, None to read the whole file and split it.
+        Sniff (callable): Test of the first bytes of the file, None if the format cannot be recognized from its content.
+    """
+    FileFormats[Name] = {'Name': Name, 'Extensions': tuple(Ext.lower() for Ext in Extensions),
+                         'Read': Read, 'ReadChunks': ReadChunks, 'Sniff': Sniff}
+
+def GetFileFormat(FileName, SniffSize=512):
+    """
+    Returns the format of a file, from its extension or else from its first bytes.
+
+    Args:
+        FileName (str): Path of the file.
+        SniffSize (int): Number of bytes read to recognize the format.
+
+    Returns:
+        Format (dict): Format of the registry, None if the format is unknown.
+    """
+    if FileName is None:
+        return None
+    for Format in FileFormats.values():
+        if FileName.lower().endswith(Format['Extensions']):
+            return Format
+
+    Formats = [Format for Format in FileFormats.values() if Format['Sniff'] is not None]
+    if not Formats or not os.path.isfile(FileName):
+        return None
+    with open(FileName, 'rb') as file:
+        Head = file.read(SniffSize)
+    for Format in Formats:
+        if Format['Sniff'](Head):
+            return Format
+    return None
+
+# Text files
+def ReadText(FileName, Engine="numpy", Cols=None, **kwargs):
+    """
+    Reads a whitespace-delimited .csv or .txt file. The C engine of pandas is used first (exact float conversion),
+    the python engine reads the files it rejects (text values, rows of different lengths).
+
+    Args:
+        FileName (str): Path of the file.
+        Engine (str): "numpy" for the C engine, "python" for the python engine only.
+        Cols (list): Columns to read, all the columns if None.
+
+    Returns:
+        Data (numpy.ndarray): Values of the file.
+    """
+    if Engine == "numpy":
+        try:
+            return pd.read_csv(FileName, header=None, sep=r'\s+', engine="c", dtype=np.float64,
+                               float_precision="round_trip", usecols=Cols).values
+        except (ValueError, pd.errors.ParserError):
+            pass  # Malformed file
+    return pd.read_csv(FileName, header=None, sep=r'\s+', engine="python", usecols=Cols).values
+
+def ReadTextChunks(FileName, Rows=100000, Engine="numpy", Cols=None, **kwargs):
+    """
+    Reads a whitespace-delimited .csv or .txt file by blocks of rows (see ReadText).
+    The python engine takes over only if the C engine fails before the first block.
+    """
+    if Engine == "numpy":
+        BStarted = False
+        try:
+            with pd.read_csv(FileName, header=None, sep=r'\s+', engine="c", dtype=np.float64,
+                             float_precision="round_trip", usecols=Cols, chunksize=Rows) as Reader:
+                for Frame in Reader:
+                    BStarted = True
+                    yield Frame.to_numpy()
+            return
+        except (ValueError, pd.errors.ParserError):
+            if BStarted:
+                raise
+    with pd.read_csv(FileName, header=None, sep=r'\s+', engine="python", usecols=Cols, chunksize=Rows) as Reader:
+        for Frame in Reader:
+            yield Frame.to_numpy()
+
+def ReadIPE(FileName, **kwargs):
+    """
+    Reads a Lagamine .ipe or .ipn file, the numeric lines are the rows.
+
+    Returns:
+        DataRows (list): List of lists of floats, one per numeric line.
+    """
+    with open(FileName, 'r') as file:
+        lines = file.readlines()
+
+    # Detect where numeric data starts and store rows properly
+    DataRows = []
+    for line in lines:
+        try:
+            DataRows.append([float(Num) for Num in line.split()])
+        except ValueError:
+            continue  # Skip non-numeric lines
+    return DataRows
+
+def ReadIPEChunks(FileName, Rows=100000, Cols=None, **kwargs):
+    """
+    Reads a Lagamine .ipe or .ipn file by blocks of rows (see ReadIPE).
+    """
+    PendingRows = []
+    with open(FileName, 'rb') as file:
+        for line in file:
+            try:
+                Row = [float(Num) for Num in line.split()]
+            except ValueError:
+                continue  # Skip non-numeric lines
+            if Row:
+                PendingRows.append(Row)
+            if len(PendingRows) == Rows:
+                Chunk = np.array(PendingRows, dtype=np.float64)
+                PendingRows = []
+                yield Chunk if Cols is None else Chunk[:, Cols]
+
+    # Last incomplete block
+    if PendingRows:
+        Chunk = np.array(PendingRows, dtype=np.float64)
+        yield Chunk if Cols is None else Chunk[:, Cols]
+
+def ReadF71File(FileName, Engine="numpy", **kwargs):
+    """
+    Reads a Lagamine .f71 file, the groups of values between the non-numeric lines are the rows.
+
+    Args:
+        FileName (str): Path of the file.
+        Engine (str): "numpy" for the vectorized F71Parser, "python" for the line by line parser.
+
+    Returns:
+        DataRows (list): List of groups.
+    """
+    if Engine == "numpy":
+        return ReadF71(FileName)
+    return ReadF71Lines(FileName)
+
+def ReadF71Chunks(FileName, Rows=100000, Cols=None, **kwargs):
+    """
+    Reads a Lagamine .f71 file by blocks of rows with the F71Parser.
+    """
+    PendingRows = []
+    Parser = F71Parser()
+    with open(FileName, 'rb') as file:
+        while True:
+            Block = file.read(2**24)
+            if Block:
+                PendingRows.extend(Parser.Feed(Block + file.readline()))
+            else:
+                PendingRows.extend(Parser.Flush())
+            while len(PendingRows) >= Rows:
+                Chunk = np.array(PendingRows[:Rows])
+                del PendingRows[:Rows]
+                yield Chunk if Cols is None else Chunk[:, Cols]
+            if not Block:
+                break
+
+    # Last incomplete block
+    if PendingRows:
+        Chunk = np.array(PendingRows, dtype=np.float64)
+        yield Chunk if Cols is None else Chunk[:, Cols]
+
+# Columnar files
+def ReadColumnar(FileName, Cols=None, Rows=None, Format=None, **kwargs):
+    """
+    Reads the data matrix from a file written by DataTable.SaveColumnar. Only the chosen columns are read from the disk,
+    and for HDF5 only the chunks / for Parquet only the row groups holding the chosen rows.
+
+    Args:
+        FileName (str): Path of the file.
+        Cols (list): Columns to read (indexes of the saved data matrix), all the saved columns if None.
+                     The columns of the loaded data matrix follow the order of Cols.
+        Rows (slice or array): Rows to read, all the rows if None.
+        Format (str): "HDF5" or "Parquet", from the extension if None.
+
+    Returns:
+        DataMatrix (numpy.ndarray): Data matrix.
+    """
+    if Rows is None:
+        Rows = slice(None)
+    if Format is None:
+        Format = "HDF5" if FileName.endswith(('.h5', '.hdf5')) else "Parquet" if FileName.endswith('.parquet') else None
+
+    if Format == "HDF5":
+        import h5py
+
+        with h5py.File(FileName, 'r') as file:
+            if Cols is None:
+                Cols = list(file.attrs['Cols'])
+            Columns = [file[f'Col{Col}'][Rows] for Col in Cols]
+
+    elif Format == "Parquet":
+        import pyarrow.parquet as pq
+
+        file = pq.ParquetFile(FileName)
+        if Cols is None:
+            Cols = [int(Name[3:]) for Name in file.schema_arrow.names]
+        Names = [f'Col{Col}' for Col in Cols]
+
+        # Only the row groups holding the rows are read
+        NRow = file.metadata.num_rows
+        GroupStart = np.cumsum([0] + [file.metadata.row_group(k).num_rows for k in range(file.num_row_groups)])
+        if isinstance(Rows, slice):
+            # Bounds of the slice, without an index of the rows
+            RowRange = range(*Rows.indices(NRow))
+            if len(RowRange):
+                Low, High = min(RowRange[0], RowRange[-1]), max(RowRange[0], RowRange[-1])
+                First = np.searchsorted(GroupStart, Low, side='right') - 1
+                Last = np.searchsorted(GroupStart, High, side='right') - 1
+                Table = file.read_row_groups(list(range(First, Last + 1)), columns=Names)
+                Table = Table.slice(Low - GroupStart[First], High - Low + 1)
+                Step = RowRange.step
+                Columns = [Table.column(Name).to_numpy()[::Step] if Step > 0 else Table.column(Name).to_numpy()[::-1][::-Step]
+                           for Name in Names]
+            else:
+                Columns = [np.empty(0) for Name in Names]
+        else:
+            # Array of rows (or boolean mask)
+            RowIndex = np.asarray(Rows)
+            RowIndex = np.flatnonzero(RowIndex) if RowIndex.dtype == bool else np.where(RowIndex < 0, RowIndex + NRow, RowIndex)
+            if RowIndex.size:
+                if RowIndex.min() < 0 or RowIndex.max() >= NRow:
+                    raise IndexError(f"row index out of range for a file of {NRow} rows")
+                Group = np.searchsorted(GroupStart, RowIndex, side='right') - 1
+                Groups = np.unique(Group)
+                Table = file.read_row_groups(Groups.tolist(), columns=Names)
+                # Position of the rows in the table of the row groups read
+                GroupSize = np.diff(GroupStart)[Groups]
+                TableStart = np.cumsum(GroupSize) - GroupSize
+                Local = RowIndex - GroupStart[Group] + TableStart[np.searchsorted(Groups, Group)]
+                Columns = [Table.column(Name).to_numpy()[Local] for Name in Names]
+            else:
+                Columns = [np.empty(0) for Name in Names]
+
+    else:
+        raise ValueError("not a .h5, .hdf5 or .parquet file")
+
+    return np.column_stack(Columns) if Columns else np.empty((0, 0))
+
+def ReadColumnarChunks(FileName, Rows=100000, Cols=None, Format=None, **kwargs):
+    """
+    Reads a file written by DataTable.SaveColumnar by blocks of rows (see ReadColumnar):
+    HDF5 by slices of the datasets, Parquet by batches streamed from the row groups.
+
+    Args:
+        FileName (str): Path of the file.
+        Rows (int): Number of rows of the blocks.
+        Cols (list): Columns to read (indexes of the saved data matrix), all the saved columns if None.
+        Format (str): "HDF5" or "Parquet", from the extension if None.
+
+    Yields:
+        Chunk (numpy.ndarray): Block of the data matrix.
+    """
+    if Format is None:
+        Format = "HDF5" if FileName.endswith(('.h5', '.hdf5')) else "Parquet" if FileName.endswith('.parquet') else None
+
+    if Format == "HDF5":
+        import h5py
+
+        with h5py.File(FileName, 'r') as file:
+            if Cols is None:
+                Cols = list(file.attrs['Cols'])
+            Datasets = [file[f'Col{Col}'] for Col in Cols]
+            NRow = int(file.attrs['NRow']) if 'NRow' in file.attrs else (len(Datasets[0]) if Datasets else 0)
+            for Start in range(0, NRow, Rows):
+                yield np.column_stack([Dataset[Start:Start + Rows] for Dataset in Datasets])
+
+    elif Format == "Parquet":
+        import pyarrow.parquet as pq
+
+        file = pq.ParquetFile(FileName)
+        if Cols is None:
+            Cols = [int(Name[3:]) for Name in file.schema_arrow.names]
+        Names = [f'Col{Col}' for Col in Cols]
+        for Batch in file.iter_batches(batch_size=Rows, columns=Names):
+            yield np.column_stack([Batch.column(Name).to_numpy(zero_copy_only=False) for Name in Names])
+
+    else:
+        raise ValueError("not a .h5, .hdf5 or .parquet file")
+
+# Excel files
+def ReadExcelChunks(FileName, Rows=100000, Sheet=None, Cols=None, **kwargs):
+    """
+    Reads an Excel file by blocks of rows with openpyxl in read-only mode (the cells are streamed, not loaded at once).
+    The rows holding only numbers and empty cells (NaN) are the rows of the data, the other rows (titles, units) are skipped.
+
+    Args:
+        FileName (str): Path of the file.
+        Rows (int): Number of rows of the blocks.
+        Sheet (str or int): Name or position of the sheet, the active sheet if None.
+        Cols (list): Columns to keep, all the columns if None.
+
+    Yields:
+        Chunk (numpy.ndarray): Block of the data matrix.
+    """
+    import openpyxl
+
+    Workbook = openpyxl.load_workbook(FileName, read_only=True, data_only=True)
+    try:
+        if Sheet is None:
+            WorkSheet = Workbook.active
+        elif isinstance(Sheet, int):
+            WorkSheet = Workbook.worksheets[Sheet]
+        else:
+            WorkSheet = Workbook[Sheet]
+
+        PendingRows = []
+        for Row in WorkSheet.iter_rows(values_only=True):
+            if all(Val is None for Val in Row):
+                continue  # Skip empty rows
+            try:
+                PendingRows.append([np.nan if Val is None else float(Val) for Val in Row])
+            except (TypeError, ValueError):
+                continue  # Skip non-numeric rows
+            if len(PendingRows) == Rows:
+                Chunk = np.array(PendingRows, dtype=np.float64)
+                PendingRows = []
+                yield Chunk if Cols is None else Chunk[:, Cols]
+
+        # Last incomplete block
+        if PendingRows:
+            Chunk = np.array(PendingRows, dtype=np.float64)
+            yield Chunk if Cols is None else Chunk[:, Cols]
+    finally:
+        Workbook.close()
+
+def ReadExcel(FileName, Sheet=None, Cols=None, **kwargs):
+    """
+    Reads an Excel file (see ReadExcelChunks).
+
+    Returns:
+        DataMatrix (numpy.ndarray): Numeric rows of the sheet.
+    """
+    Chunks = list(ReadExcelChunks(FileName, Sheet=Sheet, Cols=Cols))
+    if not Chunks:
+        return np.empty((0, 0))
+    return np.concatenate(Chunks)
+
+# Yokogawa DAE files
+def ReadDAEChunks(FileName, Rows=100000, NChannel=None, HeaderSize=0, DType='<f4', Cols=None, **kwargs):
+    """
+    Reads a binary DAE file of Yokogawa software by blocks of records, directly with np.frombuffer (no CSV export).
+    The layout depends on the recorder and on the version of the software, it is given by the arguments:
+    a header of HeaderSize bytes followed by records of NChannel values of type DType, one record per acquisition.
+
+    Args:
+        FileName (str): Path of the file.
+        Rows (int): Number of records of the blocks.
+        NChannel (int): Number of values per record.
+        HeaderSize (int): Size of the header (bytes).
+        DType (str): Type of the values, e.g. '<f4' (little-endian float32), '<i2' (int16).
+        Cols (list): Channels to keep, all the channels if None.
+
+    Yields:
+        Chunk (numpy.ndarray): Block of the data matrix (float64).
+    """
+    if NChannel is None:
+        raise ValueError("the layout of the DAE file must be given (NChannel, HeaderSize, DType)")
+
+    RecordSize = NChannel * np.dtype(DType).itemsize
+    with open(FileName, 'rb') as file:
+        file.seek(HeaderSize)
+        while True:
+            Block = file.read(Rows * RecordSize)
+            NRecord = len(Block) // RecordSize
+            if NRecord:
+                Chunk = np.frombuffer(Block, dtype=DType, count=NRecord * NChannel).reshape(NRecord, NChannel)
+                Chunk = Chunk if Cols is None else Chunk[:, Cols]
+                yield Chunk.astype(np.float64)
+            if len(Block) < Rows * RecordSize:
+                if len(Block) % RecordSize:
+                    print(f"Warning: Incomplete last record of {FileName} skipped.")
+                break
+
+def ReadDAE(FileName, NChannel=None, HeaderSize=0, DType='<f4', Cols=None, **kwargs):
+    """
+    Reads a binary DAE file of Yokogawa software (see ReadDAEChunks for the layout).
+
+    Returns:
+        DataMatrix (numpy.ndarray): One row per record.
+    """
+    if NChannel is None:
+        raise ValueError("the layout of the DAE file must be given (NChannel, HeaderSize, DType)")
+
+    with open(FileName, 'rb') as file:
+        file.seek(HeaderSize)
+        Block = file.read()
+    RecordSize = NChannel * np.dtype(DType).itemsize
+    NRecord = len(Block) // RecordSize
+    if len(Block) % RecordSize:
+        print(f"Warning: Incomplete last record of {FileName} skipped.")
+    Matrix = np.frombuffer(Block, dtype=DType, count=NRecord * NChannel).reshape(NRecord, NChannel)
+    if Cols is not None:
+        Matrix = Matrix[:, Cols]
+    return Matrix.astype(np.float64)
+
+RegisterFileFormat('Text', ('.csv', '.txt'), ReadText, ReadChunks=ReadTextChunks)
+RegisterFileFormat('Lagamine IPE', ('ipe', 'ipn'), ReadIPE, ReadChunks=ReadIPEChunks)
+RegisterFileFormat('Lagamine F71', ('.f71',), ReadF71File, ReadChunks=ReadF71Chunks)
+RegisterFileFormat('HDF5', ('.h5', '.hdf5'), partial(ReadColumnar, Format="HDF5"),
+                   ReadChunks=partial(ReadColumnarChunks, Format="HDF5"), Sniff=lambda Head: Head.startswith(b'\x89HDF\r\n\x1a\n'))
+RegisterFileFormat('Parquet', ('.parquet',), partial(ReadColumnar, Format="Parquet"),
+                   ReadChunks=partial(ReadColumnarChunks, Format="Parquet"), Sniff=lambda Head: Head.startswith(b'PAR1'))
+RegisterFileFormat('Excel', ('.xlsx', '.xlsm'), ReadExcel, ReadChunks=ReadExcelChunks,
+                   Sniff=lambda Head: Head.startswith(b'PK\x03\x04') and (b'xl/' in Head or b'[Content_Types].xml' in Head))
+RegisterFileFormat('Yokogawa DAE', ('.dae',), ReadDAE, ReadChunks=ReadDAEChunks)
+
+
+"""
+CompactMatrix
+
+Data matrix stored column by column, each column with its own dtype (e.g. int32 for the node or element numbers,
+float32 for the measures), to divide the memory of the results by about two.
+It is indexed as a 2D numpy array: a single column keeps its compact dtype, several columns are returned in float64.
+"""
+class CompactMatrix:
+    def __init__(self, Columns):
+        self.Columns = [np.ascontiguousarray(Column) for Column in Columns]
+
+    @property
+    def shape(self):
+        return (len(self.Columns[0]) if self.Columns else 0, len(self.Columns))
+
+    @property
+    def ndim(self):
+        return 2
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float64)
+
+    @property
+    def dtypes(self):
+        """ Returns the dtype of each column."""
+        return [Column.dtype for Column in self.Columns]
+
+    @property
+    def nbytes(self):
+        return sum(Column.nbytes for Column in self.Columns)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        Matrix = np.empty(self.shape, dtype=np.float64 if dtype is None else dtype)
+        for Col, Column in enumerate(self.Columns):
+            Matrix[:, Col] = Column
+        return Matrix
+
+    def __getitem__(self, Key):
+        if not isinstance(Key, tuple):
+            Key = (Key, slice(None))
+        RowKey, ColKey = Key
+
+        # Keys of np.ix_
+        if isinstance(RowKey, np.ndarray) and RowKey.ndim == 2:
+            RowKey = RowKey[:, 0]
+        if isinstance(ColKey, np.ndarray) and ColKey.ndim == 2:
+            ColKey = ColKey[0]
+
+        # Single column, in its dtype
+        if isinstance(ColKey, (int, np.integer)):
+            return self.Columns[ColKey][RowKey]
+
+        # Several columns, in float64
+        Cols = range(len(self.Columns))[ColKey] if isinstance(ColKey, slice) else np.arange(len(self.Columns))[ColKey]
+        Columns = [self.Columns[Col][RowKey] for Col in Cols]
+        if isinstance(RowKey, (int, np.integer)):
+            return np.array(Columns, dtype=np.float64)
+        NRow = len(Columns[0]) if Columns else len(self.Columns[0][RowKey])
+        Matrix = np.empty((NRow, len(Columns)))
+        for Col, Column in enumerate(Columns):
+            Matrix[:, Col] = Column
+        return Matrix
+
+def InferDTypePlan(Matrix, RelTol=0):
+    """
+    Returns the compact dtype of each column of a matrix:
+    - int32 for the columns of integers in the int32 range (node and element numbers, step counters),
+    - float32 for the columns whose float32 values differ from the values by at most RelTol (relative error),
+    - float64 otherwise.
+
+    Args:
+        Matrix (numpy.ndarray): Data matrix.
+        RelTol (float): Accepted relative error of the float32 columns. 0 keeps the values exact,
+                        1e-6 keeps about 6 significant digits (float32 keeps about 7).
+
+    Returns:
+        DTypePlan (list): numpy dtype of each column.
+    """
+    Int32 = np.iinfo(np.int32)
+    DTypePlan = []
+    for Col in range(Matrix.shape[1]):
+        Column = np.asarray(Matrix[:, Col], dtype=np.float64)
+        with np.errstate(over='ignore', invalid='ignore'):
+            if np.all(np.isfinite(Column)) and np.all(Column == np.rint(Column)) and \
+                    (Column.size == 0 or (Column.min() >= Int32.min and Column.max() <= Int32.max)):
+                DTypePlan.append(np.dtype(np.int32))
+                continue
+            Column32 = Column.astype(np.float32).astype(np.float64)
+            BSame = (np.abs(Column32 - Column) <= RelTol * np.abs(Column)) | (Column32 == Column) | \
+                (np.isnan(Column32) & np.isnan(Column))
+        DTypePlan.append(np.dtype(np.float32) if np.all(BSame) else np.dtype(np.float64))
+    return DTypePlan
+
+
+# Selection arguments of DataTable.IterSelect (the other arguments of DataTable.ReduceSteps go to the reader)
+SelectKeys = ('Col', 'Val', 'Tol', 'AbsTol', 'ValMin', 'ValMax', 'BClosest')
+
+"""
+DataTable
+
+Data matrix of a file (or of several files) with its loading, indexes, selections and preprocessing.
+DataLag and DataRecord are subclasses of DataTable, the optimizations are made here only.
+"""
+class DataTable:
+    def __init__(self):
+        # File
+        self.FileName = None
+        self.FileNames = None  # Files merged by LoadFiles
+        self.SourceCol = None  # Column of the data matrix holding the index of the source file in FileNames
+        self.FollowState = None  # State of the incremental reader of Follow (offset, parser, buffer)
+
+        # Data
+        self.Data = None
+        self.DataMatrix = None
+        self.ColIndex = {}  # Sorted index of the columns {Col: (SortOrder, SortedVal)}, built on demand
+
+        # Data Analysis and Visualization
+        self.AbsCol = None
+        self.OrdCol = None
+        self.TimeCol = None
+        self.SelectCol = None
+
+        self.AbsVal = None
+        self.OrdVal = None
+        self.TimeVal = None
+
+        self.PLTIndex = None
+        self.PLTDataMatrix = None  # Materialized on demand from PLTIndex
+        self.PLTColumns = {}  # Columns of the selection materialized on demand {Col: Array}
+
+        self.TimeStepArray = None
+        # Time step index: stable order of the rows by time, matrix sorted by time and bounds of each step
+        self.StepOrder = None
+        self.StepMatrix = None
+        self.StepStart = None
+        self.StepCount = None
+
+    # File
+    @property
+    def getFileName(self):
+        return self.FileName
+
+    @getFileName.setter
+    def getFileName(self, value):
+        self.FileName = value
+        self.FollowState = None
+
+    @property
+    def getFileNames(self):
+        return self.FileNames
+
+    @property
+    def getSourceCol(self):
+        return self.SourceCol
+
+    @property
+    def getApprovedFiles(self):
+        """Returns the extensions of the formats of the registry (see RegisterFileFormat)."""
+        return [Ext for Format in FileFormats.values() for Ext in Format['Extensions']]
+
+    @property
+    def BoolApprovedFiles(self):
+        """Returns True if the format of the file is in the registry, otherwise False."""
+        return GetFileFormat(self.FileName) is not None
+    
+    # Data
+    @property
+    def getData(self):
+        return self.Data
+
+    @getData.setter
+    def getData(self, value):
+        self.Data = value
+
+    @property
+    def getDataMatrix(self):
+        return self.DataMatrix
+
+    @getDataMatrix.setter
+    def getDataMatrix(self, Matrix):
+        self.DataMatrix = Matrix
+        # The sorted indexes of the columns and the time step index are rebuilt for the new matrix
+        self.ColIndex = {}
+        self.ResetTimeStepIndex()
+
+    @property
+    def getNRow(self):
+        """
+        Returns the number of rows in the data matrix.
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return None
+        print("Number of rows: [ 0 ;", self.getDataMatrix.shape[0], "]")
+
+        return self.getDataMatrix.shape[0]
+
+    @property
+    def getNRowSimpli(self):
+        """
+        Returns the number of rows in the data matrix. Simplified version, without print
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return None
+
+        return self.getDataMatrix.shape[0]
+
+    @property
+    def getNCol(self):
+        """
+        Returns the number of columns in the data matrix.
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return None
+        print("Number of columns: [ 0 ;", self.getDataMatrix.shape[1], "]")
+
+        return self.getDataMatrix.shape[1]
+
+    @property
+    def getNColSimpli(self):
+        """
+        Returns the number of columns in the data matrix. Simplified version, without print
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return None
+
+        return self.getDataMatrix.shape[1]
+
+    @property
+    def getNStep(self):
+        """
+        Returns the number of time steps in the data matrix.
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return None
+
+        if self.getTimeCol is None:
+            print("Error: No time column selected.")
+            return None
+
+        # Extract the time steps
+        if self.getTimeStepArray is None:
+            TimeStepArray = self.SetTimeStepArray
+        else:
+            TimeStepArray = self.getTimeStepArray
+
+        # Count the number of time steps
+        NStep = len(TimeStepArray)
+
+        print("Number of time steps: [ 0 ;", NStep, "]")
+        return NStep
+
+    @property
+    def getNStepSimpli(self):
+        """
+        Returns the number of time steps in the data matrix. Simplified version, without print
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return None
+
+        if self.getTimeCol is None:
+            print("Error: No time column selected.")
+            return None
+
+        # Extract the time steps
+        if self.getTimeStepArray is None:
+            TimeStepArray = self.SetTimeStepArray
+        else:
+            TimeStepArray = self.getTimeStepArray
+
+        # Count the number of time steps
+        NStep = len(TimeStepArray)
+
+        return NStep
+
+
+    # Data Analysis and Visualization
+    @property
+    def getAbsCol(self):
+        return self.AbsCol
+
+    @getAbsCol.setter
+    def getAbsCol(self, value):
+        self.AbsCol = value
+
+    @property
+    def getOrdCol(self):
+        return self.OrdCol
+
+    @getOrdCol.setter
+    def getOrdCol(self, value):
+        self.OrdCol = value
+
+    @property
+    def getTimeCol(self):
+        return self.TimeCol
+
+    @getTimeCol.setter
+    def getTimeCol(self, value):
+        self.TimeCol = value
+        self.ResetTimeStepIndex()
+
+    @property
+    def getSelectCol(self):
+        return self.SelectCol
+
+    @getSelectCol.setter
+    def getSelectCol(self, value):
+        self.SelectCol = value
+
+    @property
+    def getAbsVal(self):
+        # Extracted on demand from the selection
+        if self.AbsVal is None and self.getAbsCol is not None and self.getPLTIndex is not None:
+            self.AbsVal = self.PLTColumn(self.getAbsCol)
+        return self.AbsVal
+
+    @getAbsVal.setter
+    def getAbsVal(self, Array):
+        self.AbsVal = Array
+
+    @property
+    def getOrdVal(self):
+        # Extracted on demand from the selection
+        if self.OrdVal is None and self.getOrdCol is not None and self.getPLTIndex is not None:
+            self.OrdVal = self.PLTColumn(self.getOrdCol)
+        return self.OrdVal
+
+    @getOrdVal.setter
+    def getOrdVal(self, Array):
+        self.OrdVal = Array
+
+    @property
+    def getTimeVal(self):
+        # Extracted on demand from the selection
+        if self.TimeVal is None and self.getTimeCol is not None and self.getPLTIndex is not None:
+            self.TimeVal = self.PLTColumn(self.getTimeCol)
+        return self.TimeVal
+
+    @getTimeVal.setter
+    def getTimeVal(self, Array):
+        self.TimeVal = Array
+
+    @property
+    def getPLTIndex(self):
+        return self.PLTIndex
+
+    @getPLTIndex.setter
+    def getPLTIndex(self, Array):
+        self.PLTIndex = Array
+        # The selected data are extracted again on demand
+        self.ResetPLTData()
+
+    @property
+    def getPLTMask(self):
+        """ Returns the selection as a boolean mask over the rows of the data matrix."""
+        if self.getPLTIndex is None:
+            return None
+        Mask = np.zeros(self.getNRowSimpli, dtype=bool)
+        Mask[self.getPLTIndex] = True
+        return Mask
+
+    @property
+    def getPLTDataMatrix(self):
+        # Materialized on the first access after a selection
+        if self.PLTDataMatrix is None and self.getPLTIndex is not None and self.getDataMatrix is not None:
+            self.PLTDataMatrix = self.getDataMatrix[self.getPLTIndex, :]
+        return self.PLTDataMatrix
+
+    @getPLTDataMatrix.setter
+    def getPLTDataMatrix(self, Matrix):
+        self.PLTDataMatrix = Matrix
+
+    @property
+    def ResetPLTIndex(self):
+        """ Resets the index selection array."""
+        self.getPLTIndex = np.arange(self.getNRowSimpli)
+        self.getPLTDataMatrix = self.getDataMatrix
+
+    def ResetPLTData(self):
+        """ Drops the data extracted from the selection (PLTDataMatrix, columns, abscissa, ordinate and time)."""
+        self.PLTDataMatrix = None
+        self.PLTColumns = {}
+        self.AbsVal = None
+        self.OrdVal = None
+        self.TimeVal = None
+
+    def PLTColumn(self, Col):
+        """
+        Returns a column of the selected rows, extracted on the first call only.
+
+        Args:
+            Col (int): Column index.
+
+        Returns:
+            Array (numpy.ndarray): Values of the column for the rows of PLTIndex.
+        """
+        if Col not in self.PLTColumns:
+            if self.PLTDataMatrix is not None:
+                self.PLTColumns[Col] = self.PLTDataMatrix[:, Col]
+            else:
+                self.PLTColumns[Col] = self.getDataMatrix[self.getPLTIndex, Col]
+        return self.PLTColumns[Col]
+
+    @property
+    def getTimeStepArray(self):
+        return self.TimeStepArray
+
+    @getTimeStepArray.setter
+    def getTimeStepArray(self, Array):
+        self.TimeStepArray = Array
+
+    @property
+    def SetTimeStepArray(self):
+        if self.SetTimeStepIndex is False:
+            return False
+        return self.getTimeStepArray
+
+    @property
+    def SetTimeStepIndex(self):
+        """
+        Builds the time step index: the rows sorted by time (stable sort) and the first row and number of rows of each time step.
+        The matrix sorted by time (a copy of the data matrix) is only built by the first StepView or IterSteps (see getStepMatrix).
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return False
+
+        if self.getTimeCol is None:
+            print("Error: No time column selected.")
+            return False
+
+        # Stable order of the rows by time, shared with the sorted index of the time column
+        StepOrder, SortedTimeVal = self.GetColIndex(self.getTimeCol)
+
+        # Extract the unique time steps and their bounds in the sorted matrix
+        self.getTimeStepArray, self.StepStart, self.StepCount = np.unique(SortedTimeVal, return_index=True, return_counts=True)
+        self.StepOrder = StepOrder
+        return True
+
+    def ResetTimeStepIndex(self):
+        """ Resets the time step index (data matrix or time column changed)."""
+        self.TimeStepArray = None
+        self.StepOrder = None
+        self.StepMatrix = None
+        self.StepStart = None
+        self.StepCount = None
+
+    @property
+    def getStepOrder(self):
+        return self.StepOrder
+
+    @property
+    def getStepMatrix(self):
+        """ Returns the matrix sorted by time, built on the first call, the steps are then zero-copy slices of it."""
+        if self.StepMatrix is None and self.StepOrder is not None:
+            self.StepMatrix = np.asarray(self.getDataMatrix[self.StepOrder])
+        return self.StepMatrix
+
+    """
+    # Methods
+    """
+    # File loading
+    def LoadFile(self, BLoadMatrix=False, Engine="numpy", BCache=False, Cols=None, DTypePlan=None, **ReadArgs):
+        """
+        Reads the file and extracts numerical data, keeping row structure intact.
+        The reader is chosen in the registry of the file formats (see RegisterFileFormat).
+
+        Args:
+            BLoadMatrix (bool): If True, the data matrix is built after loading.
+            Engine (str): "numpy" for the fast parsers (vectorized F71Parser, C engine of pandas for .csv and .txt files),
+                          "python" for the line by line parsers.
+            BCache (bool): If True, the data matrix is memory-mapped from the binary cache when it is up to date,
+                           otherwise the file is parsed and the cache is written.
+            Cols (list): Columns to read (.csv, .txt, HDF5, Parquet, Excel and DAE files), all the columns if None.
+            DTypePlan: Plan of the compact data matrix built with BLoadMatrix (see CompactDataMatrix), None for float64.
+            ReadArgs: Arguments of the reader, e.g. Sheet for Excel files, NChannel, HeaderSize and DType for DAE files.
+        """
+        Format = GetFileFormat(self.FileName)
+        if Format is None:
+            print("Error: File format not approved.")
+            return None
+
+        # Binary cache of the data matrix (the whole matrix, read with the default arguments only)
+        if BCache and Cols is None and not ReadArgs:
+            if self.LoadCache() is None:
+                # Key of the file read, taken before reading: a file modified during the parse is not cached as it is now
+                Key = self.FileKey()
+                if self.LoadFile(BLoadMatrix=True, Engine=Engine) is None:
+                    return None
+                self.SaveCache(Key=Key)
+            if DTypePlan is not None:
+                self.CompactDataMatrix(DTypePlan=DTypePlan)
+            return self.getData
+
+        try:
+            self.getData = Format['Read'](self.FileName, Engine=Engine, Cols=Cols, **ReadArgs)
+        except ImportError as e:
+            print(f"Error: {e}. It is needed to read the {Format['Name']} files.")
+            return None
+        except Exception as e:
+            print(f"Error reading file {self.FileName}: {e}")
+            return None
+
+        if BLoadMatrix:
+            self.LoadDataMatrix(DTypePlan=DTypePlan)
+        return self.getData
+
+    def LoadDataMatrix(self, DTypePlan=None, RelTol=0):
+        """
+        Returns the extracted data as a NumPy matrix.
+
+        Args:
+            DTypePlan: None for a float64 matrix, otherwise the plan of the compact matrix (see CompactDataMatrix).
+            RelTol (float): Accepted relative error of the inferred float32 columns (see InferDTypePlan).
+        """
+        if self.getData is None:
+            print("Error: No data to convert.")
+            return False
+
+        self.getDataMatrix = np.asarray(self.getData)
+        if DTypePlan is not None:
+            self.CompactDataMatrix(DTypePlan=DTypePlan, RelTol=RelTol)
+        return self.getDataMatrix
+
+    def CompactDataMatrix(self, DTypePlan="auto", RelTol=0):
+        """
+        Stores the data matrix column by column with a compact dtype per column (CompactMatrix).
+        The selections, time steps and plots work the same on the compact matrix.
+
+        Args:
+            DTypePlan: "auto" to infer the dtypes (see InferDTypePlan), a list with the dtype of each column,
+                       or a dict {Col: dtype} of the columns whose dtype is given, the other ones being inferred.
+            RelTol (float): Accepted relative error of the inferred float32 columns.
+
+        Returns:
+            DataMatrix (CompactMatrix): Compact data matrix.
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return None
+
+        Matrix = self.getDataMatrix
+        if isinstance(DTypePlan, (list, tuple)):
+            if len(DTypePlan) != Matrix.shape[1]:
+                print("Error: The dtype plan must give one dtype per column.")
+                return None
+            Plan = [np.dtype(DType) for DType in DTypePlan]
+        else:
+            Plan = InferDTypePlan(Matrix, RelTol=RelTol)
+            if isinstance(DTypePlan, dict):
+                for Col, DType in DTypePlan.items():
+                    Plan[Col] = np.dtype(DType)
+
+        self.getDataMatrix = CompactMatrix([np.asarray(Matrix[:, Col]).astype(DType) for Col, DType in enumerate(Plan)])
+        # The raw data would keep the float64 values in memory
+        self.getData = self.getDataMatrix
+        return self.getDataMatrix
+
+    # Growing files
+    def Follow(self, ChunkSize=2**24, BFlush=False):
+        """
+        Reads the rows appended to the .f71 file since the previous call, e.g. while the simulation is running.
+        Only the new complete lines are parsed: the byte offset and the group being captured by the F71Parser are kept
+        between the calls, and the rows are appended to a buffer growing by doubling (DataMatrix is a view of it).
+
+        Args:
+            ChunkSize (int): Approximate size of the blocks read in bytes.
+            BFlush (bool): If True, the group still being captured is closed (end of the simulation).
+
+        Returns:
+            NNewRow (int): Number of rows appended to the data matrix, None if the file cannot be read.
+        """
+        if self.FileName is None or not self.FileName.endswith(('.f71', '.F71')):
+            print("Error: Follow only reads .f71 files.")
+            return None
+
+        try:
+            Size = os.path.getsize(self.FileName)
+            # The file was replaced or truncated, it is read again from the start
+            if self.FollowState is None or Size < self.FollowState['Offset']:
+                self.FollowState = {'Offset': 0, 'Parser': F71Parser(), 'Buffer': None, 'NRow': 0}
+            State = self.FollowState
+
+            Groups = []
+            with open(self.FileName, 'rb') as file:
+                file.seek(State['Offset'])
+                while True:
+                    Chunk = file.read(ChunkSize)
+                    if not Chunk:
+                        break
+                    # Only complete lines are parsed, the last line may still be written
+                    End = Chunk.rfind(b'\n') + 1
+                    if End == 0:
+                        if len(Chunk) < ChunkSize:
+                            break
+                        Chunk += file.readline()
+                        if not Chunk.endswith(b'\n'):
+                            break
+                        End = len(Chunk)
+                    Groups.extend(State['Parser'].Feed(Chunk[:End]))
+                    State['Offset'] += End
+                    file.seek(State['Offset'])
+                # At the end of the simulation the last line is complete even without a line break
+                if BFlush:
+                    file.seek(State['Offset'])
+                    Chunk = file.read()
+                    Groups.extend(State['Parser'].Feed(Chunk))
+                    State['Offset'] += len(Chunk)
+        except OSError as e:
+            print(f"Error reading Fortran file {self.FileName}: {e}")
+            return None
+
+        if BFlush:
+            Groups.extend(State['Parser'].Flush())
+        if not Groups:
+            return 0
+
+        # The groups of the same length as the first one are the rows
+        NCol = len(Groups[0]) if State['Buffer'] is None else State['Buffer'].shape[1]
+        Rows = [Group for Group in Groups if len(Group) == NCol]
+        if len(Rows) < len(Groups):
+            print(f"Warning: {len(Groups) - len(Rows)} groups of {self.FileName} skipped (not {NCol} values).")
+        if not Rows:
+            return 0
+
+        # Amortized doubling of the buffer
+        NRow = State['NRow'] + len(Rows)
+        if State['Buffer'] is None or NRow > State['Buffer'].shape[0]:
+            Capacity = max(NRow, 2 * (0 if State['Buffer'] is None else State['Buffer'].shape[0]), 1024)
+            Buffer = np.empty((Capacity, NCol))
+            if State['Buffer'] is not None:
+                Buffer[:State['NRow']] = State['Buffer'][:State['NRow']]
+            State['Buffer'] = Buffer
+        State['Buffer'][State['NRow']:NRow] = Rows
+        State['NRow'] = NRow
+
+        self.getData = State['Buffer'][:NRow]
+        self.getDataMatrix = self.getData
+        return len(Rows)
+
+    # Multiple files
+    def LoadFiles(self, FileNames, Workers=None, BAlignTime=False, Engine="numpy", BCache=False):
+        """
+        Loads several files of the same layout in parallel and merges them in one data matrix.
+        A column holding the index of the source file in FileNames is added at the end of the matrix.
+
+        Args:
+            FileNames (list): Paths of the files.
+            Workers (int): Number of processes. If None, the number of CPUs. If 1, the files are loaded in this process.
+            BAlignTime (bool): If True, the rows of all the files are sorted by the time column (stable sort),
+                               otherwise the files are concatenated in the given order.
+            Engine (str): Parser of the .f71 files (see LoadFile).
+            BCache (bool): If True, the binary cache of each file is used (see LoadFile).
+
+        Returns:
+            DataMatrix (numpy.ndarray): Merged data matrix.
+        """
+        FileNames = list(FileNames)
+        if not FileNames:
+            print("Error: No file given.")
+            return None
+
+        if BAlignTime and self.getTimeCol is None:
+            print("Error: No time column selected.")
+            return None
+
+        # Parse the files, the text parsing runs in separate processes
+        Loader = partial(LoadFileMatrix, Engine=Engine, BCache=BCache)
+        if Workers == 1 or len(FileNames) == 1:
+            Matrices = [Loader(FileName) for FileName in FileNames]
+        else:
+            with ProcessPoolExecutor(max_workers=Workers) as Pool:
+                Matrices = list(Pool.map(Loader, FileNames))
+
+        for FileName, Matrix in zip(FileNames, Matrices):
+            if Matrix is None or Matrix.ndim != 2:
+                print(f"Error: No data matrix for file {FileName}.")
+                return None
+        NCol = Matrices[0].shape[1]
+        if any(Matrix.shape[1] != NCol for Matrix in Matrices):
+            print("Error: The files do not have the same number of columns.")
+            return None
+
+        # Merge the matrices in a preallocated matrix with the source file column
+        NRows = [Matrix.shape[0] for Matrix in Matrices]
+        DataMatrix = np.empty((sum(NRows), NCol + 1))
+        Start = 0
+        for Index, Matrix in enumerate(Matrices):
+            DataMatrix[Start:Start + NRows[Index], :NCol] = Matrix
+            DataMatrix[Start:Start + NRows[Index], NCol] = Index
+            Start += NRows[Index]
+
+        if BAlignTime:
+            DataMatrix = DataMatrix[np.argsort(DataMatrix[:, self.getTimeCol], kind='stable')]
+
+        self.FileNames = FileNames
+        self.SourceCol = NCol
+        self.getData = DataMatrix
+        self.getDataMatrix = DataMatrix
+        return self.getDataMatrix
+
+    # Out-of-core iteration
+    def IterChunks(self, Rows=100000, Cols=None, **ReadArgs):
+        """
+        Reads the file by blocks of rows without loading the whole file in memory
+        (formats with a chunked reader, the other files are read at once and split).
+
+        Args:
+            Rows (int): Number of rows of the blocks (the last block may be smaller).
+            Cols (list): Columns to keep. If None, all the columns are kept.
+            ReadArgs: Arguments of the reader (see LoadFile).
+
+        Yields:
+            Chunk (numpy.ndarray): Block of the data matrix of shape (Rows, NCol).
+        """
+        Format = GetFileFormat(self.FileName)
+        if Format is None:
+            print("Error: File format not approved.")
+            return
+
+        if Format['ReadChunks'] is not None:
+            yield from Format['ReadChunks'](self.FileName, Rows=Rows, Cols=Cols, **ReadArgs)
+            return
+
+        Matrix = np.asarray(Format['Read'](self.FileName, Cols=Cols, **ReadArgs))
+        for Start in range(0, Matrix.shape[0], Rows):
+            yield Matrix[Start:Start + Rows]
+
+    def IterSelect(self, Col=None, Val=None, Tol=0.001, AbsTol=None, ValMin=None, ValMax=None, BClosest=False,
+                   Rows=100000, Cols=None, **ReadArgs):
+        """
+        Selects rows based on the values in a column, block by block (same selection rules as SelectIndex).
+        With BClosest, a first pass over the file finds the closest value.
+
+        Args:
+            Col (int): Column index to select by.
+            Val (float): Value to select.
+            Tol (float): Tolerance for selection.
+            AbsTol (float): Absolute tolerance for selection.
+            ValMin (float): Minimum value for selection.
+            ValMax (float): Maximum value for selection.
+            BClosest (bool): If True, selects the closest value to val value instead of exact match.
+            Rows (int): Number of rows of the blocks read from the file.
+            Cols (list): Columns to keep. If None, all the columns are kept.
+            ReadArgs: Arguments of the reader (see LoadFile).
+
+        Yields:
+            Chunk (numpy.ndarray): Selected rows of each block.
+        """
+        # Select the column to select by
+        if Col is None:
+            if self.getSelectCol is None:
+                print("Error: No column selected.")
+                return
+            Col = self.getSelectCol
+
+        if BClosest:
+            # First pass: closest value over the whole file
+            DistMin, ValClosest = np.inf, None
+            for Chunk in self.IterChunks(Rows=Rows, Cols=[Col], **ReadArgs):
+                if Chunk.shape[0] == 0:
+                    continue
+                Dist = np.abs(Chunk[:, 0] - Val)
+                IndexClosestVal = np.argmin(Dist)
+                if Dist[IndexClosestVal] < DistMin:
+                    DistMin, ValClosest = Dist[IndexClosestVal], Chunk[IndexClosestVal, 0]
+            if ValClosest is None:
+                print("Warning: No data selected.")
+                return
+            Val = ValClosest
+        elif Val is None and (ValMin is None or ValMax is None):
+            print("Error: No value or range selected.")
+            return
+
+        # Get the accepted tolerance
+        if Val is not None and AbsTol is None:
+            AbsTol = np.abs(Tol*Val)
+
+        for Chunk in self.IterChunks(Rows=Rows, **ReadArgs):
+            ArrayExtractedVal = Chunk[:, Col]
+            if Val is not None:
+                Mask = np.abs(ArrayExtractedVal - Val) <= AbsTol
+            else:
+                Mask = (ArrayExtractedVal >= ValMin) & (ArrayExtractedVal <= ValMax)
+            Chunk = Chunk[Mask]
+            yield Chunk if Cols is None else Chunk[:, Cols]
+
+    def ReduceSteps(self, Cols=None, TimeCol=None, Rows=100000, **Args):
+        """
+        Computes the minimum, maximum and mean of columns per time step, block by block.
+
+        Args:
+            Cols (list): Columns to reduce. If None, all the columns are reduced.
+            TimeCol (int): Time column. If None, the time column of the object is used.
+            Rows (int): Number of rows of the blocks read from the file.
+            Args: Optional selection applied first (arguments of IterSelect: Col, Val, ValMin, ...)
+                  and arguments of the reader (see LoadFile).
+
+        Returns:
+            TimeStepArray (numpy.ndarray): Sorted time steps.
+            MinMatrix, MaxMatrix, MeanMatrix (numpy.ndarray): Reductions of shape (NStep, NCol).
+        """
+        if TimeCol is None:
+            if self.getTimeCol is None:
+                print("Error: No time column selected.")
+                return None
+            TimeCol = self.getTimeCol
+
+        SelectArgs = {Key: Val for Key, Val in Args.items() if Key in SelectKeys}
+        ReadArgs = {Key: Val for Key, Val in Args.items() if Key not in SelectKeys}
+        if SelectArgs:
+            Chunks = self.IterSelect(Rows=Rows, **SelectArgs, **ReadArgs)
+        else:
+            Chunks = self.IterChunks(Rows=Rows, **ReadArgs)
+
+        # Running reductions per time step
+        Steps = {}
+        for Chunk in Chunks:
+            if Chunk.shape[0] == 0:
+                continue
+            Values = Chunk if Cols is None else Chunk[:, Cols]
+            TimeVal, Inverse = np.unique(Chunk[:, TimeCol], return_inverse=True)
+            Order = np.argsort(Inverse, kind='stable')
+            Starts = np.searchsorted(Inverse[Order], np.arange(TimeVal.size))
+            SortedValues = Values[Order]
+            ChunkMin = np.minimum.reduceat(SortedValues, Starts, axis=0)
+            ChunkMax = np.maximum.reduceat(SortedValues, Starts, axis=0)
+            ChunkSum = np.add.reduceat(SortedValues, Starts, axis=0)
+            ChunkCount = np.diff(np.append(Starts, SortedValues.shape[0]))
+            for k, Time in enumerate(TimeVal):
+                if Time in Steps:
+                    Step = Steps[Time]
+                    np.minimum(Step[0], ChunkMin[k], out=Step[0])
+                    np.maximum(Step[1], ChunkMax[k], out=Step[1])
+                    Step[2] += ChunkSum[k]
+                    Step[3] += ChunkCount[k]
+                else:
+                    Steps[Time] = [ChunkMin[k].copy(), ChunkMax[k].copy(), ChunkSum[k].copy(), ChunkCount[k]]
+
+        if not Steps:
+            print("Warning: No data selected.")
+            return None
+
+        TimeStepArray = np.array(sorted(Steps))
+        MinMatrix = np.array([Steps[Time][0] for Time in TimeStepArray])
+        MaxMatrix = np.array([Steps[Time][1] for Time in TimeStepArray])
+        MeanMatrix = np.array([Steps[Time][2] / Steps[Time][3] for Time in TimeStepArray])
+        return TimeStepArray, MinMatrix, MaxMatrix, MeanMatrix
+
+    # Binary cache
+    @property
+    def getCacheFileName(self):
+        """
+        Returns the names of the cache files of the data matrix (.npy) and of its key (.json).
+        """
+        if self.getFileName is None:
+            return None
+        return self.getFileName + '.cache.npy', self.getFileName + '.cache.json'
+
+    def FileKey(self, BHash=True):
+        """
+        Returns the key identifying the content of the file: path, size, modification time and content hash.
+
+        Args:
+            BHash (bool): If True, the content hash is computed (the whole file is read).
+        """
+        Stat = os.stat(self.getFileName)
+        Key = {'Path': os.path.abspath(self.getFileName),
+               'Size': Stat.st_size,
+               'MTime': Stat.st_mtime_ns}
+        if BHash:
+            Hash = hashlib.blake2b(digest_size=16)
+            with open(self.getFileName, 'rb') as file:
+                for Chunk in iter(lambda: file.read(2**24), b''):
+                    Hash.update(Chunk)
+            Key['Hash'] = Hash.hexdigest()
+        return Key
+
+    def SaveCache(self, Key=None):
+        """
+        Saves the data matrix in a .npy file next to the data file, with the key of the data file.
+
+        Args:
+            Key (dict): Key of the data file when it was read (see FileKey). If None, it is computed now.
+                        The cache is not written if the file changed since.
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return False
+
+        if Key is None:
+            Key = self.FileKey()
+        elif any(Key[Name] != Val for Name, Val in self.FileKey(BHash=False).items()):
+            print(f"Warning: {self.FileName} changed while read, the cache is not written.")
+            return False
+
+        CacheFileName, KeyFileName = self.getCacheFileName
+        TempFileNames = []
+        try:
+            # Write in temporary files of unique names first, so that another process never reads a partial cache
+            # and two processes caching the same file do not write in the same temporary files
+            for FileName in (CacheFileName, KeyFileName):
+                with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(FileName)),
+                                                 prefix=os.path.basename(FileName) + '.', suffix='.tmp', delete=False) as file:
+                    TempFileNames.append(file.name)
+                    if FileName == CacheFileName:
+                        np.save(file, np.asarray(self.getDataMatrix))
+                    else:
+                        file.write(json.dumps(Key).encode())
+            os.replace(TempFileNames[0], CacheFileName)
+            os.replace(TempFileNames[1], KeyFileName)
+        except OSError as e:
+            for FileName in TempFileNames:
+                if os.path.exists(FileName):
+                    os.remove(FileName)
+            print(f"Warning: Cache of {self.FileName} not written: {e}")
+            return False
+        return True
+
+    def LoadCache(self):
+        """
+        Memory-maps the data matrix from the cache if the key of the data file did not change.
+
+        Returns:
+            DataMatrix (numpy.memmap): Read-only data matrix, None if the cache is missing or outdated.
+        """
+        CacheFileName, KeyFileName = self.getCacheFileName
+        if not (os.path.exists(CacheFileName) and os.path.exists(KeyFileName)):
+            return None
+
+        try:
+            with open(KeyFileName, 'r') as file:
+                CacheKey = json.load(file)
+            # Cheap checks first, the content hash is only computed if they match
+            Key = self.FileKey(BHash=False)
+            if any(CacheKey.get(Name) != Val for Name, Val in Key.items()):
+                return None
+            if CacheKey.get('Hash') != self.FileKey()['Hash']:
+                return None
+            Matrix = np.load(CacheFileName, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"Warning: Cache of {self.FileName} not readable: {e}")
+            return None
+
+        self.getData = Matrix
+        self.getDataMatrix = Matrix
+        return self.getDataMatrix
+
+    # Columnar files
+    def SaveColumnar(self, FileName, Cols=None, ChunkRows=2**16, Compression=None):
+        """
+        Saves the data matrix column by column, so that a few columns can be read back without reading the others.
+        The format is chosen by the extension: HDF5 (.h5, .hdf5, with h5py) or Parquet (.parquet, with pyarrow).
+
+        Args:
+            FileName (str): Name of the file.
+            Cols (list): Columns to save, all the columns if None.
+            ChunkRows (int): Number of rows of the HDF5 chunks / Parquet row groups.
+            Compression (str): Compression of the columns, "gzip" for HDF5 and "zstd" for Parquet if None.
+        """
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return False
+
+        if Cols is None:
+            Cols = range(self.getDataMatrix.shape[1])
+        Cols = list(Cols)
+        NRow = self.getDataMatrix.shape[0]
+
+        try:
+            if FileName.endswith(('.h5', '.hdf5')):
+                import h5py
+
+                with h5py.File(FileName, 'w') as file:
+                    # One dataset per column, named after its index in the data matrix
+                    for Col in Cols:
+                        file.create_dataset(f'Col{Col}', data=np.asarray(self.getDataMatrix[:, Col]),
+                                            chunks=(min(ChunkRows, NRow),) if NRow else None,
+                                            compression=Compression or 'gzip', shuffle=True)
+                    file.attrs['Cols'] = Cols
+                    file.attrs['NRow'] = NRow
+
+            elif FileName.endswith('.parquet'):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                Table = pa.table({f'Col{Col}': np.asarray(self.getDataMatrix[:, Col]) for Col in Cols})
+                pq.write_table(Table, FileName, row_group_size=ChunkRows, compression=Compression or 'zstd')
+
+            else:
+                print("Error: File format not approved.")
+                return False
+
+        except ImportError as e:
+            print(f"Error: {e}. h5py is needed for HDF5 files and pyarrow for Parquet files.")
+            return False
+        except OSError as e:
+            print(f"Error writing file {FileName}: {e}")
+            return False
+        return True
+
+    def LoadColumnar(self, FileName=None, Cols=None, Rows=None):
+        """
+        Reads the data matrix from a file written by SaveColumnar, see ReadColumnar.
+
+        Args:
+            FileName (str): Name of the file, the current file if None.
+            Cols (list): Columns to read (indexes of the saved data matrix), all the saved columns if None.
+            Rows (slice): Rows to read, all the rows if None.
+
+        Returns:
+            DataMatrix (numpy.ndarray): Data matrix, None if the file cannot be read.
+        """
+        if FileName is None:
+            FileName = self.getFileName
+
+        try:
+            self.getData = ReadColumnar(FileName, Cols=Cols, Rows=Rows)
+        except ImportError as e:
+            print(f"Error: {e}. h5py is needed for HDF5 files and pyarrow for Parquet files.")
+            return None
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Error reading file {FileName}: {e}")
+            return None
+
+        self.getDataMatrix = self.getData
+        return self.getDataMatrix
+
+    # Sorted column indexes
+    def GetColIndex(self, Col):
+        """
+        Returns the sorted index of a column, built on the first call (O(n log n)) and kept until the data matrix is replaced.
+
+        Args:
+            Col (int): Column index.
+
+        Returns:
+            SortOrder (numpy.ndarray): Row indexes sorting the column (stable sort).
+            SortedVal (numpy.ndarray): Sorted values of the column.
+        """
+        if Col not in self.ColIndex:
+            # float64 as the original matrix: the tests of a compact (float32) column would be made in float32 (NEP 50)
+            ArrayExtractedVal = np.asarray(self.getDataMatrix[:, Col], dtype=np.float64)
+            SortOrder = np.argsort(ArrayExtractedVal, kind='stable')
+            self.ColIndex[Col] = (SortOrder, ArrayExtractedVal[SortOrder])
+        return self.ColIndex[Col]
+
+    def IndexInRange(self, Col, ValMin, ValMax):
+        """
+        Returns the sorted indexes of the rows with ValMin <= value <= ValMax in a column, in O(log n + k).
+        """
+        SortOrder, SortedVal = self.GetColIndex(Col)
+        Start = np.searchsorted(SortedVal, ValMin, side='left')
+        End = np.searchsorted(SortedVal, ValMax, side='right')
+        return np.sort(SortOrder[Start:End])
+
+    def IndexWithinTol(self, Col, Val, AbsTol):
+        """
+        Returns the sorted indexes of the rows with abs(value - Val) <= AbsTol in a column, in O(log n + k).
+        """
+        SortOrder, SortedVal = self.GetColIndex(Col)
+        # Slightly wider range, then the exact test of the full scan on the few candidates
+        Margin = 4 * np.finfo(np.float64).eps * (np.abs(Val) + np.abs(AbsTol))
+        Start = np.searchsorted(SortedVal, Val - AbsTol - Margin, side='left')
+        End = np.searchsorted(SortedVal, Val + AbsTol + Margin, side='right')
+        Candidates = SortOrder[Start:End]
+        Candidates = Candidates[np.abs(SortedVal[Start:End] - Val) <= AbsTol]
+        return np.sort(Candidates)
+
+    def ClosestVal(self, Col, Val):
+        """
+        Returns the value of a column closest to Val, in O(log n + k).
+        In case of tie, the value of the first row is returned (as np.argmin on the column).
+        """
+        SortOrder, SortedVal = self.GetColIndex(Col)
+        # np.argmin returns the first NaN if the column has any
+        if np.isnan(SortedVal[-1]):
+            return SortedVal[np.searchsorted(SortedVal, np.nan, side='left')]
+
+        # Neighbours of Val in the sorted column
+        Pos = np.searchsorted(SortedVal, Val)
+        Neighbours = SortedVal[max(Pos - 1, 0):Pos + 1]
+        DistMin = np.min(np.abs(Neighbours - Val))
+
+        # All the rows at the minimal distance, the first row is kept
+        Margin = 4 * np.finfo(np.float64).eps * (np.abs(Val) + DistMin)
+        Start = np.searchsorted(SortedVal, Val - DistMin - Margin, side='left')
+        End = np.searchsorted(SortedVal, Val + DistMin + Margin, side='right')
+        BClosest = np.abs(SortedVal[Start:End] - Val) == DistMin
+        return SortedVal[Start:End][BClosest][np.argmin(SortOrder[Start:End][BClosest])]
+
+    # Queries
+    def Query(self, BFromSelection=False):
+        """
+        Starts a query on the data (see DataQuery), e.g. Query().WhereTime(Val=10).Unique(Col=0).OrderBy(Col=2).Matrix()
+
+        Args:
+            BFromSelection (bool): If True, the query starts from the selected rows (PLTIndex), otherwise from all the rows.
+
+        Returns:
+            Query (DataQuery): Empty query.
+        """
+        return DataQuery(self, Index=self.getPLTIndex if BFromSelection else None)
+
+    # Time steps
+    def StepView(self, Step):
+        """
+        Returns the rows of a time step as a zero-copy slice of the matrix sorted by time.
+        On a CompactMatrix, the rows of the step only are extracted (in float64), the matrix sorted by time is not built.
+
+        Args:
+            Step (int): Index of the time step in TimeStepArray.
+
+        Returns:
+            StepMatrix (numpy.ndarray): Rows of the time step, in their original order.
+        """
+        if self.StepOrder is None and self.SetTimeStepIndex is False:
+            return None
+
+        if not -len(self.StepStart) <= Step < len(self.StepStart):
+            print("Error: Time step out of range.")
+            return None
+
+        Start = self.StepStart[Step]
+        return self.StepRows(Start, self.StepCount[Step])
+
+    def IterSteps(self):
+        """
+        Iterates over the time steps.
+
+        Yields:
+            Time (float): Time of the step.
+            StepMatrix (numpy.ndarray): Rows of the time step (see StepView).
+        """
+        if self.StepOrder is None and self.SetTimeStepIndex is False:
+            return
+
+        for Time, Start, Count in zip(self.getTimeStepArray, self.StepStart, self.StepCount):
+            yield Time, self.StepRows(Start, Count)
+
+    def StepRows(self, Start, Count):
+        """ Returns the rows Start to Start + Count of the order by time (slice of the sorted matrix, or rows of a CompactMatrix)."""
+        if isinstance(self.getDataMatrix, CompactMatrix):
+            return self.getDataMatrix[self.StepOrder[Start:Start + Count]]
+        return self.getStepMatrix[Start:Start + Count]
+
+    def TimeStep2Time(self, Step):
+        """
+        Translates time step indexes into times.
+
+        Args:
+            Step (int or array): Index of the time step in TimeStepArray.
+
+        Returns:
+            Time (float or array): Time of the step.
+        """
+        if self.StepOrder is None and self.SetTimeStepIndex is False:
+            return None
+
+        return self.getTimeStepArray[Step]
+
+    def Time2TimeStep(self, Time, BClosest=True):
+        """
+        Translates times into time step indexes, in O(log n).
+
+        Args:
+            Time (float or array): Time to translate.
+            BClosest (bool): If True, the closest time step is returned, otherwise the time must be a time step.
+
+        Returns:
+            Step (int or array): Index of the time step in TimeStepArray, None if a time is not a time step (BClosest False).
+        """
+        if self.StepOrder is None and self.SetTimeStepIndex is False:
+            return None
+
+        # Closest of the two neighbouring time steps (the earlier one in case of tie)
+        TimeStepArray = self.getTimeStepArray
+        Pos = np.searchsorted(TimeStepArray, Time)
+        Left = np.maximum(Pos - 1, 0)
+        Right = np.minimum(Pos, len(TimeStepArray) - 1)
+        Step = np.where(np.abs(Time - TimeStepArray[Left]) <= np.abs(TimeStepArray[Right] - Time), Left, Right)
+
+        if not BClosest and np.any(TimeStepArray[Step] != Time):
+            print("Error: Time is not a time step.")
+            return None
+
+        return Step if np.ndim(Step) else int(Step)
+
+    # Data Analysis and Visualization
+    def SelectIndex(self, Col=None, Val=None, Tol=0.001, AbsTol=None, ValMin=None, ValMax=None, BClosest=False):
+        """
+        Selects rows based on the values in a column and updates the index selection array.
+
+        Args:
+            Col (int): Column index to select by.
+            Val (float): Value to select.
+            Tol (float): Tolerance for selection.
+            AbsTol (float): Absolute tolerance for selection.
+            ValMin (float): Minimum value for selection.
+            ValMax (float): Maximum value for selection.
+            BClosest (bool): If True, selects the closest value to val value instead of exact match.
+        
+        Improvements:
+        - Add the possibility to extract the values directly from the pltDataMatrix
+        """
+        # Verify that the data matrix is not empty
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return False
+
+        # Select the column to select by
+        if Col is None:
+            if self.getSelectCol is None:
+                print("Error: No column selected.")
+                return False
+            Col = self.getSelectCol
+
+        # Select rows based on the values in the column, among the selected rows
+        Query = self.Query(BFromSelection=True).Where(Col=Col, Val=Val, Tol=Tol, AbsTol=AbsTol,
+                                                      ValMin=ValMin, ValMax=ValMax, BClosest=BClosest)
+        NewPLTIndex = Query.Run()
+        if NewPLTIndex is None:
+            return False
+
+        # Update the index selection array
+        self.getPLTIndex = NewPLTIndex
+
+        # Verifies that the selection is not empty
+        if len(self.getPLTIndex) == 0:
+            print("Warning: No data selected.")
+
+    def SelectTime(self, Val=None, Tol=0, AbsTol=None, ValMin=None, ValMax=None, BClosest=False):
+        self.SelectIndex(Col=self.getTimeCol,
+                         Val=Val, Tol=Tol, AbsTol=AbsTol,
+                         ValMin=ValMin, ValMax=ValMax, BClosest=BClosest)
+
+    def SelectAbs(self, Val=None, Tol=0, AbsTol=None, ValMin=None, ValMax=None, BClosest=False):
+        self.SelectIndex(Col=self.getAbsCol,
+                         Val=Val, Tol=Tol, AbsTol=AbsTol,
+                         ValMin=ValMin, ValMax=ValMax, BClosest=BClosest)
+
+    def SelectOrd(self, Val=None, Tol=0, AbsTol=None, ValMin=None, ValMax=None, BClosest=False):
+        self.SelectIndex(Col=self.getOrdCol,
+                         Val=Val, Tol=Tol, AbsTol=AbsTol,
+                         ValMin=ValMin, ValMax=ValMax, BClosest=BClosest)
+
+    def SelectIndexNoDuplicate(self, Col=None, Tol=0.001, AbsTol=None, ValPolicy=0):
+        """
+        From the selected index, select the unique values in the given column.
+
+        Args:
+            Col (int): Column index to select by.
+            Tol (float): Tolerance for selection.
+            AbsTol (float): Absolute tolerance for selection.
+            ValPolicy (int): Policy for selecting the value to keep in case of duplicates. (-1: last, 0: first, x: x+1th value)
+        
+        Improvements:
+        - Add the possibility to extract the values directly from the pltDataMatrix
+        """
+        # Verify that the data matrix is not empty
+        if self.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return False
+
+        # Select the column to select by
+        if Col is None:
+            if self.getSelectCol is None:
+                print("Error: No column selected.")
+                return False
+            Col = self.getSelectCol
+
+        # Unique values over the whole column, then intersection with the selected rows
+        Query = self.Query(BFromSelection=True).Unique(Col=Col, Tol=Tol, AbsTol=AbsTol, ValPolicy=ValPolicy, BAllRows=True)
+
+        # Update the index selection array
+        self.getPLTIndex = Query.Run()
+
+        # Verifies that the selection is not empty
+        if len(self.getPLTIndex) == 0:
+            print("Warning: No data selected.")
+
+    def SortResults(self, Col=None):
+        """
+        Sorts the differents values by a given column.
+
+        Improvements:
+        - Add the possibility to extract the values directly from the pltDataMatrix
+        """
+        # Verify that the index selection array is not empty
+        if self.getPLTIndex is None:
+            print("Error: No index selected.")
+            return False
+
+        # Select the column to sort by
+        if Col is None:
+            if self.getSelectCol is None:
+                print("Error: No column selected.")
+                return False
+            Col = self.getSelectCol
+
+        # Sort the PLTIndex array by the values in the selected column (the PLTDataMatrix follows on demand)
+        self.getPLTIndex = self.Query(BFromSelection=True).OrderBy(Col=Col).Run()
+
+    def PLTPreprocessing(self):
+        """
+        Preprocesses data for plotting by putting them into the right variables.
+        """
+        # Verify that the index selection array is not empty
+        if self.getPLTIndex is None:
+            print("Warning: No index selected. Resetting the index.")
+            self.ResetPLTIndex
+
+        if self.getAbsCol is None:
+            print("Error: No abscissa column selected.")
+            return False
+
+        if self.getOrdCol is None:
+            print("Error: No ordinate column selected.")
+            return False
+
+        # The data to plot (abscissa, ordinate and time) are extracted on demand,
+        # only these columns of the selected rows are copied
+        self.AbsVal = None
+        self.OrdVal = None
+        self.TimeVal = None
+        if self.getTimeCol is None:
+            print("Warning: No time column selected.")
+
+"""
+DataQuery
+
+Selection of rows of a DataTable described as a whole (filters, unique values, order, columns) and planned before running:
+- the filters are run from the most selective one, with the sorted indexes of the columns,
+  or by testing the remaining rows once they are fewer than the rows of the index range,
+- the unique values and the order are computed on the filtered rows only.
+The query does not change the DataTable, Apply() stores the result as the selection.
+"""
+class DataQuery:
+    def __init__(self, Data, Index=None):
+        self.Data = Data
+        self.Index = Index  # Rows the query starts from, None for all the rows
+        self.Filters = []
+        self.Uniques = []
+        self.OrderCol = None
+        self.Cols = None
+
+    def Where(self, Col=None, Val=None, Tol=0.001, AbsTol=None, ValMin=None, ValMax=None, BClosest=False):
+        """
+        Adds a filter on a column, with the same arguments as DataTable.SelectIndex.
+        With BClosest, the closest value is looked for in the whole column, as SelectIndex.
+        """
+        self.Filters.append({'Col': Col, 'Val': Val, 'Tol': Tol, 'AbsTol': AbsTol,
+                             'ValMin': ValMin, 'ValMax': ValMax, 'BClosest': BClosest})
+        return self
+
+    def WhereTime(self, Val=None, Tol=0, AbsTol=None, ValMin=None, ValMax=None, BClosest=False):
+        return self.Where(Col=self.Data.getTimeCol, Val=Val, Tol=Tol, AbsTol=AbsTol, ValMin=ValMin, ValMax=ValMax, BClosest=BClosest)
+
+    def WhereAbs(self, Val=None, Tol=0, AbsTol=None, ValMin=None, ValMax=None, BClosest=False):
+        return self.Where(Col=self.Data.getAbsCol, Val=Val, Tol=Tol, AbsTol=AbsTol, ValMin=ValMin, ValMax=ValMax, BClosest=BClosest)
+
+    def WhereOrd(self, Val=None, Tol=0, AbsTol=None, ValMin=None, ValMax=None, BClosest=False):
+        return self.Where(Col=self.Data.getOrdCol, Val=Val, Tol=Tol, AbsTol=AbsTol, ValMin=ValMin, ValMax=ValMax, BClosest=BClosest)
+
+    def Unique(self, Col=None, Tol=0.001, AbsTol=None, ValPolicy=0, BAllRows=False):
+        """
+        Keeps one row per value of a column, with the same arguments as DataTable.SelectIndexNoDuplicate.
+
+        Args:
+            BAllRows (bool): If True, the unique values are looked for in the whole column and intersected with
+                             the rows (behaviour of SelectIndexNoDuplicate), otherwise among the filtered rows only.
+        """
+        self.Uniques.append({'Col': Col, 'Tol': Tol, 'AbsTol': AbsTol, 'ValPolicy': ValPolicy, 'BAllRows': BAllRows})
+        return self
+
+    def OrderBy(self, Col=None):
+        """ Sorts the rows by the values of a column."""
+        self.OrderCol = self.Data.getSelectCol if Col is None else Col
+        return self
+
+    def Columns(self, Cols):
+        """ Columns returned by Matrix()."""
+        self.Cols = Cols
+        return self
+
+    def Plan(self):
+        """
+        Translates the filters into index ranges and sorts them from the most selective one.
+
+        Returns:
+            Plan (list): List of filters (Col, Kind, A, B, NRows), Kind being 'Tol' (Val, AbsTol) or 'Range' (ValMin, ValMax),
+                         None if a filter is not valid.
+        """
+        Plan = []
+        for Filter in self.Filters:
+            Col = Filter['Col'] if Filter['Col'] is not None else self.Data.getSelectCol
+            if Col is None:
+                print("Error: No column selected.")
+                return None
+            Val, AbsTol = Filter['Val'], Filter['AbsTol']
+            if Val is not None and Filter['BClosest'] is False:
+                Kind = 'Tol'
+            elif Filter['ValMin'] is not None and Filter['ValMax'] is not None:
+                Kind = 'Range'
+            elif Filter['BClosest']:
+                Kind = 'Tol'
+                Val = self.Data.ClosestVal(Col, Val)
+            else:
+                print("Error: No value or range selected.")
+                return None
+
+            # Number of rows of the index range, to run the most selective filters first
+            SortOrder, SortedVal = self.Data.GetColIndex(Col)
+            if Kind == 'Tol':
+                if AbsTol is None:
+                    AbsTol = np.abs(Filter['Tol']*Val)
+                NRows = np.searchsorted(SortedVal, Val + AbsTol, side='right') - np.searchsorted(SortedVal, Val - AbsTol, side='left')
+                Plan.append((Col, Kind, Val, AbsTol, NRows))
+            else:
+                NRows = np.searchsorted(SortedVal, Filter['ValMax'], side='right') - np.searchsorted(SortedVal, Filter['ValMin'], side='left')
+                Plan.append((Col, Kind, Filter['ValMin'], Filter['ValMax'], NRows))
+
+        Plan.sort(key=lambda Step: Step[4])
+        return Plan
+
+    def Run(self):
+        """
+        Runs the query.
+
+        Returns:
+            Index (numpy.ndarray): Selected rows, in increasing order unless OrderBy is used. None if the query is not valid.
+        """
+        if self.Data.getDataMatrix is None:
+            print("Error: No data matrix.")
+            return None
+
+        Plan = self.Plan()
+        if Plan is None:
+            return None
+
+        # Filters, from the most selective one
+        Index = self.Index
+        if Plan and Index is not None:
+            Index = np.sort(Index)
+        for Col, Kind, A, B, NRows in Plan:
+            if Index is not None and len(Index) <= NRows:
+                # Test of the remaining rows
+                ArrayExtractedVal = np.asarray(self.Data.getDataMatrix[Index, Col], dtype=np.float64)
+                if Kind == 'Tol':
+                    Index = Index[np.abs(ArrayExtractedVal - A) <= B]
+                else:
+                    Index = Index[(ArrayExtractedVal >= A) & (ArrayExtractedVal <= B)]
+            else:
+                # Sorted index of the column
+                if Kind == 'Tol':
+                    NewIndex = self.Data.IndexWithinTol(Col, A, B)
+                else:
+                    NewIndex = self.Data.IndexInRange(Col, A, B)
+                Index = NewIndex if Index is None else np.intersect1d(Index, NewIndex, assume_unique=True)
+
+        # Unique values on the filtered rows
+        for Unique in self.Uniques:
+            Col = Unique['Col'] if Unique['Col'] is not None else self.Data.getSelectCol
+            if Col is None:
+                print("Error: No column selected.")
+                return None
+            if Unique['BAllRows'] or Index is None:
+                NewIndex = UniqueIndex(self.Data.getDataMatrix[:, Col], Tol=Unique['Tol'], AbsTol=Unique['AbsTol'], ValPolicy=Unique['ValPolicy'])
+                Index = NewIndex if Index is None else np.intersect1d(Index, NewIndex, assume_unique=True)
+            elif len(Index):
+                Kept = UniqueIndex(self.Data.getDataMatrix[Index, Col], Tol=Unique['Tol'], AbsTol=Unique['AbsTol'], ValPolicy=Unique['ValPolicy'])
+                Index = Index[Kept]
+
+        if Index is None:
+            Index = np.arange(self.Data.getNRowSimpli)
+
+        # Order of the rows
+        if self.OrderCol is not None:
+            Index = Index[np.argsort(np.asarray(self.Data.getDataMatrix[Index, self.OrderCol], dtype=np.float64))]
+
+        return Index
+
+    def Matrix(self):
+        """
+        Runs the query and extracts the selected rows and columns.
+
+        Returns:
+            Matrix (numpy.ndarray): Selected data, None if the query is not valid.
+        """
+        Index = self.Run()
+        if Index is None:
+            return None
+        if self.Cols is None:
+            return self.Data.getDataMatrix[Index, :]
+        return self.Data.getDataMatrix[np.ix_(Index, self.Cols)]
+
+    def Apply(self):
+        """
+        Runs the query and stores the result as the selection (PLTIndex) of the DataTable.
+
+        Returns:
+            Index (numpy.ndarray): Selected rows, None if the query is not valid.
+        """
+        Index = self.Run()
+        if Index is not None:
+            self.Data.getPLTIndex = Index
+        return Index
+
+def UniqueIndex(ArrayExtractedVal, Tol=0.001, AbsTol=None, ValPolicy=0):
+    """
+    Returns the sorted indexes of the values kept once the duplicates of an array are removed.
+
+    Args:
+        ArrayExtractedVal (numpy.ndarray): Values.
+        Tol (float): Tolerance for selection.
+        AbsTol (float): Absolute tolerance for selection.
+        ValPolicy (int): Policy for selecting the value to keep in case of duplicates. (-1: last, 0: first, x: x+1th value)
+
+    Returns:
+        Index (numpy.ndarray): Sorted indexes of the kept values.
+    """
+    # Tests in float64, also for the compact columns
+    ArrayExtractedVal = np.asarray(ArrayExtractedVal, dtype=np.float64)
+
+    # In case AbsTol is None, the tolerance is set based on the relative tolerance
+    if AbsTol is None:
+        BRelTol = True
+    else:
+        BRelTol = False
+
+    # Sort the values and keep the indices
+    SortedIndices = np.argsort(ArrayExtractedVal)
+    SortedArrayExtractedVal = ArrayExtractedVal[SortedIndices]
+
+    # Append a dummy value to trigger final group processing
+    if BRelTol:
+        DummyVal = SortedArrayExtractedVal[-1] + 10 * np.abs(Tol * (SortedArrayExtractedVal[-1] + 1))
+    else:
+        DummyVal = SortedArrayExtractedVal[-1] + 10 * AbsTol
+
+    # Get the accepted absolute tolerance of each value if not given. Based on the relative tolerance
+    if BRelTol:
+        AbsTol = np.abs(Tol * SortedArrayExtractedVal)
+
+    # A group of duplicates ends where the difference to the next value is greater than the absolute tolerance
+    BGroupEnd = np.abs(np.diff(SortedArrayExtractedVal, append=DummyVal)) > AbsTol
+    GroupEnd = np.flatnonzero(BGroupEnd)
+    GroupStart = np.concatenate(([0], GroupEnd[:-1] + 1))
+
+    # Choose the index to be kept in each group: the ValPolicy+1th value, the last one if the group is too small or ValPolicy < 0
+    if ValPolicy >= 0:
+        KeptPos = np.where(ValPolicy < GroupEnd - GroupStart + 1, GroupStart + ValPolicy, GroupEnd)
+    else:
+        KeptPos = GroupEnd
+
+    # Sort the index of the kept values by resorting the original array
+    return np.sort(SortedIndices[KeptPos])
+
+def LoadFileMatrix(FileName, Engine="numpy", BCache=False):
+    """
+    Loads the data matrix of a file (worker of DataTable.LoadFiles).
+
+    Args:
+        FileName (str): Path of the file.
+        Engine (str): Parser of the .f71 files (see DataTable.LoadFile).
+        BCache (bool): If True, the binary cache of the file is used.
+
+    Returns:
+        DataMatrix (numpy.ndarray): Data matrix of the file, None if the file could not be loaded.
+    """
+    Data = DataTable()
+    Data.getFileName = FileName
+    if Data.LoadFile(BLoadMatrix=True, Engine=Engine, BCache=BCache) is None:
+        return None
+    return np.asarray(Data.getDataMatrix)
@@ -8,18 +8,74 @@ Created on Tuesday Sept  30 11:20:09 2025
 # Library for mathematical operations on data 
 
 # Other Lib
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
 import pandas as pd
-from scipy.signal import medfilt, savgol_filter, butter, filtfilt, bessel, wiener
+from scipy.signal import medfilt, savgol_filter, butter, filtfilt, bessel, wiener, correlate, sosfilt, lfilter, convolve
+from scipy.ndimage import median_filter
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy import integrate
-from pykalman import KalmanFilter
 
 # Custom Lib
 from DataManagementLib import LenData
 
+# Filter design
+@lru_cache(maxsize=128)
+def DesignFilter(FilterType, Order, FCut, FSample, BType, Output='ba'):
+    """
+    Returns the coefficients of a Butterworth or Bessel filter, designed once per set of parameters (LRU cache).
+
+    Args:
+        FilterType (str): 'butter' or 'bessel'.
+        Order (int): Order of the filter.
+        FCut (float or tuple): Cutoff frequency, or (low, high) frequencies of 'bandpass' and 'bandstop' filters.
+        FSample (float): Sampling frequency of the data.
+        BType (str): Type of the filter. Can be 'low', 'high', 'bandpass' or 'bandstop'.
+        Output (str): 'ba' for the numerator and denominator, 'sos' for second-order sections.
+
+    Returns:
+        B (array), A (array): Numerator and denominator of the filter, or SOS (array) for Output='sos'.
+        The arrays are shared by all the callers through the cache, so they are read-only.
+    """
+    Nyquist = 0.5 * FSample
+    NormalCutoff = np.asarray(FCut) / Nyquist
+    if FilterType == 'butter':
+        Coefs = butter(N=Order, Wn=NormalCutoff, btype=BType, analog=False, output=Output)
+    else:
+        Coefs = bessel(N=Order, Wn=NormalCutoff, btype=BType, analog=False, output=Output)
+    for Coef in (Coefs if isinstance(Coefs, tuple) else (Coefs,)):
+        Coef.setflags(write=False)
+    return Coefs
+
+def FilterKey(FCut):
+    """ Returns the cutoff frequencies as a hashable key of DesignFilter."""
+    return tuple(np.ravel(FCut).tolist()) if np.ndim(FCut) else float(FCut)
+
+def LastAxis(Data, Axis):
+    """
+    Returns the data with Axis moved last, as a contiguous array: the filters of scipy are faster along contiguous rows.
+    The result is put back with np.moveaxis(Result, -1, Axis).
+    """
+    Data = np.asarray(Data)
+    if Data.ndim == 1:
+        return Data
+    return np.ascontiguousarray(np.moveaxis(Data, Axis, -1))
+
+def AxisKernel(Data, FWindow, Axis):
+    """ Returns the size of a window applied along one axis of the data (1 along the other axes)."""
+    KernelSize = [1] * np.ndim(Data)
+    KernelSize[Axis] = FWindow
+    return KernelSize
+
 """
 DataTreatment
 
+The filters accept 1D arrays or 2D arrays of channels, filtered along Axis in one call
+(Axis=0 for the columns of a data matrix, one channel per column).
+
 # Improvement to be done:
 - Add differents data treatment methods
 - Add differents links with DataLag class
@@ -29,21 +85,65 @@ class DataTreatment:
         pass
         # Data
 
-    def DTMovingAverage(self, Data, FWindow=5):
+    def DTMovingAverage(self, Data, FWindow=5, Axis=0):
         """
         Applys a moving average filter to the data.
-        From scipy library.
+        Same result as np.convolve(Data, np.ones(FWindow)/FWindow, mode='same') (zero padding),
+        computed in O(N) from the cumulative sum whatever the size of the window.
         
         Args:
             Data (array): Input data array.
             FWindow (int): Size of the moving average filter window.
+            Axis (int): Axis along which the data is filtered.
 
         Returns:
             Data (array): Filtered data array.
         """
-        return np.convolve(Data, np.ones(FWindow)/FWindow, mode='same')
+        Data = np.moveaxis(np.asarray(Data, dtype=float), Axis, 0)
+        NData = Data.shape[0]
+        if Data.ndim == 1 and FWindow <= 16:
+            # The direct convolution is faster for small windows
+            return np.convolve(Data, np.ones(FWindow)/FWindow, mode='same')
+        if NData < FWindow:
+            # np.convolve returns max(NData, FWindow) values in this case
+            Result = np.apply_along_axis(np.convolve, 0, Data, np.ones(FWindow)/FWindow, mode='same')
+            return np.moveaxis(Result, 0, Axis)
+
+        # Sums of the windows [n - FWindow//2, n + (FWindow-1)//2] by differences of the cumulative sum.
+        # The data is centered to limit the round-off of the cumulative sum (the zero padding becomes -Mean)
+        Mean = Data.mean(axis=0)
+        Padded = np.empty((NData + FWindow - 1,) + Data.shape[1:])
+        Padded[:] = -Mean
+        np.subtract(Data, Mean, out=Padded[FWindow // 2:FWindow // 2 + NData])
+        CumSum = np.zeros((NData + FWindow,) + Data.shape[1:])
+        np.cumsum(Padded, axis=0, out=CumSum[1:])
+        Result = (CumSum[FWindow:] - CumSum[:-FWindow]) / FWindow + Mean
+        return np.moveaxis(Result, 0, Axis)
+
+    def DTConvolve(self, Data, Kernel, Axis=0, Method='auto'):
+        """
+        Convolves the data with a kernel along an axis.
+        Same result as np.convolve(Data, Kernel, mode='same') for each channel, with the FFT for long kernels.
+        From scipy library.
+
+        Args:
+            Data (array): Input data array.
+            Kernel (array): 1D kernel.
+            Axis (int): Axis along which the data is convolved.
+            Method (str): 'fft', 'direct' or 'auto' (choice of scipy.signal.convolve).
+
+        Returns:
+            Data (array): Convolved data array.
+        """
+        Data = np.asarray(Data, dtype=float)
+        Kernel = np.asarray(Kernel, dtype=float)
+        NData, NKernel = Data.shape[Axis], len(Kernel)
+        Full = convolve(Data, Kernel.reshape(AxisKernel(Data, NKernel, Axis)), mode='full', method=Method)
+        # Central part of the full convolution, as np.convolve mode='same'
+        Start = (min(NData, NKernel) - 1) // 2
+        return np.take(Full, np.arange(Start, Start + max(NData, NKernel)), axis=Axis)
 
-    def DTMedianFilter(self, Data, FWindow=5):
+    def DTMedianFilter(self, Data, FWindow=5, Axis=0):
         """
         Applys a median filter to the data.
         From scipy library.
@@ -51,12 +151,18 @@ class DataTreatment:
         Args:
             Data (array): Input data array.
             FWindow (int): Size of the median filter window. Must be an odd integer.
+            Axis (int): Axis along which the data is filtered.
         Returns:
             Data (array): Filtered data array.
         """
-        return medfilt(Data, kernel_size=FWindow)
+        Data = np.asarray(Data)
+        if Data.ndim == 1:
+            return medfilt(Data, kernel_size=FWindow)
+        # Same zero padding as medfilt, with the faster filter of scipy.ndimage
+        Result = median_filter(LastAxis(Data.astype(float), Axis), size=AxisKernel(Data, FWindow, -1), mode='constant', cval=0.0)
+        return np.moveaxis(Result, -1, Axis)
 
-    def DTSavitzkyGolay(self, Data, FWindow=5, PolyOrder=2):
+    def DTSavitzkyGolay(self, Data, FWindow=5, PolyOrder=2, Axis=0):
         """
         Applys a Savitzky-Golay filter to the data.
         From scipy library.
@@ -65,13 +171,15 @@ class DataTreatment:
             Data (array): Input data array.
             FWindow (int): Size of the filter window. Must be an odd integer.
             PolyOrder (int): Order of the polynomial used to fit the samples. Must be less than FWindow.
+            Axis (int): Axis along which the data is filtered.
 
         Returns:
             Data (array): Filtered data array.
         """
-        return savgol_filter(Data, window_length=FWindow, polyorder=PolyOrder)
+        Result = savgol_filter(LastAxis(Data, Axis), window_length=FWindow, polyorder=PolyOrder, axis=-1)
+        return np.moveaxis(Result, -1, Axis) if Result.ndim > 1 else Result
 
-    def DTButterworth(self, Data, FSample=1.0, FCut=0.1, Order=4, BType='low'):
+    def DTButterworth(self, Data, FSample=1.0, FCut=0.1, Order=4, BType='low', Axis=0):
         """
         Applys a Butterworth filter to the data.
         From scipy library.
@@ -81,15 +189,15 @@ class DataTreatment:
             FCut (float): Cutoff frequency of the filter.
             Order (int): Order of the filter.
             BType (str): Type of the filter. Can be 'low', 'high', 'bandpass' or 'bandstop'.
+            Axis (int): Axis along which the data is filtered.
         Returns:
             Data (array): Filtered data array.
         """
-        Nyquist = 0.5 * FSample
-        NormalCutoff = FCut / Nyquist
-        BButter, AButter = butter(N=Order, Wn=NormalCutoff, btype=BType, analog=False)
-        return filtfilt(BButter, AButter, Data)
+        BButter, AButter = DesignFilter('butter', Order, FilterKey(FCut), float(FSample), BType)
+        Result = filtfilt(BButter, AButter, LastAxis(Data, Axis), axis=-1)
+        return np.moveaxis(Result, -1, Axis) if Result.ndim > 1 else Result
 
-    def DTBessel(self, Data, FSample=1.0, FCut=0.1, Order=4, BType='low'):
+    def DTBessel(self, Data, FSample=1.0, FCut=0.1, Order=4, BType='low', Axis=0):
         """
         Applys a Bessel filter to the data.
         From scipy library.
@@ -99,16 +207,16 @@ class DataTreatment:
             FCut (float): Cutoff frequency of the filter.
             Order (int): Order of the filter.
             BType (str): Type of the filter. Can be 'low', 'high', 'bandpass' or 'bandstop'.
+            Axis (int): Axis along which the data is filtered.
 
         Returns:
             Data (array): Filtered data array.
         """
-        Nyquist = 0.5 * FSample
-        NormalCutoff = FCut / Nyquist
-        BBessel, ABessel = bessel(N=Order, Wn=NormalCutoff, btype=BType, analog=False)
-        return filtfilt(BBessel, ABessel, Data)
+        BBessel, ABessel = DesignFilter('bessel', Order, FilterKey(FCut), float(FSample), BType)
+        Result = filtfilt(BBessel, ABessel, LastAxis(Data, Axis), axis=-1)
+        return np.moveaxis(Result, -1, Axis) if Result.ndim > 1 else Result
 
-    def DTWiener(self, Data, MySize=5, Noise=None):
+    def DTWiener(self, Data, MySize=5, Noise=None, Axis=0):
         """
         Applys a Wiener filter to the data.
         From scipy library.
@@ -116,18 +224,33 @@ class DataTreatment:
         Args:
             Data (array): Input data array.
             MySize (int): Size of the Wiener filter window.
-            Noise (float): Estimated noise power. If None, it is estimated from the data.
+            Noise (float): Estimated noise power. If None, it is estimated from the data (of each channel for 2D data).
+            Axis (int): Axis along which the data is filtered.
 
         Returns:
             Data (array): Filtered data array.
         """
-        return wiener(Data, mysize=MySize, noise=Noise)
+        Data = np.asarray(Data)
+        if Data.ndim == 1:
+            return wiener(Data, mysize=MySize, noise=Noise)
+
+        # Same computation as scipy.signal.wiener, with a window along Axis and the noise of each channel
+        Data = Data.astype(float)
+        Window = np.ones(AxisKernel(Data, MySize, Axis))
+        LocalMean = correlate(Data, Window, 'same') / MySize
+        LocalVar = correlate(Data**2, Window, 'same') / MySize - LocalMean**2
+        if Noise is None:
+            Noise = np.mean(LocalVar, axis=Axis, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Result = (Data - LocalMean) * (1 - Noise / LocalVar) + LocalMean
+        return np.where(LocalVar < Noise, LocalMean, Result)
 
     def DTKalman(self, Data, TransitionMatrix=1, ObservationMatrix=1, InitialStateMean=0, 
-                 InitialStateCovariance=1, ObservationCovariance=1, TransitionCovariance=0.01):
+                 InitialStateCovariance=1, ObservationCovariance=1, TransitionCovariance=0.01, BSmooth=False, Axis=0):
         """
         Applys a Kalman filter to the data.
-        From pykalman library.
+        Scalar model: vectorized filter (ScalarKalmanFilter), 2D data being independent channels filtered along Axis.
+        Matrix model: from pykalman library (imported only in this case), the rows of Data being the observations.
 
         Args:
             Data (array): Input data array.
@@ -137,47 +260,522 @@ class DataTreatment:
             InitialStateCovariance (float or array): Initial state covariance.
             ObservationCovariance (float or array): Observation covariance.
             TransitionCovariance (float or array): Transition covariance.
+            BSmooth (bool): If True, the states are smoothed (Rauch-Tung-Striebel smoother).
+            Axis (int): Axis along which the data is filtered (scalar model).
 
         Returns:
             Data (array): Filtered data array.
         """
+        Model = (TransitionMatrix, ObservationMatrix, InitialStateCovariance, ObservationCovariance, TransitionCovariance)
+        if all(np.size(Val) == 1 for Val in Model):
+            A, H, P0, R, Q = (float(np.ravel(Val)[0]) for Val in Model)
+            Data = np.moveaxis(np.asarray(Data, dtype=float), Axis, 0)
+            StateMeans, StateCovariances, _ = ScalarKalmanFilter(Data, A, H, Q, R, InitialStateMean, P0)
+            if BSmooth:
+                StateMeans = ScalarKalmanSmoother(StateMeans, StateCovariances, A, Q)
+            return np.moveaxis(StateMeans, 0, Axis)
+
+        try:
+            from pykalman import KalmanFilter
+        except ImportError:
+            print("Error: pykalman is needed for the Kalman filter with matrices.")
+            return None
+
         kf = KalmanFilter(transition_matrices=TransitionMatrix,
                           observation_matrices=ObservationMatrix,
                           initial_state_mean=InitialStateMean,
                           initial_state_covariance=InitialStateCovariance,
                           observation_covariance=ObservationCovariance,
                           transition_covariance=TransitionCovariance)
-        StateMeans, _ = kf.filter(Data)
+        if BSmooth:
+            StateMeans, _ = kf.smooth(Data)
+        else:
+            StateMeans, _ = kf.filter(Data)
         return StateMeans.flatten()
 
+# Scalar Kalman filter
+def ScalarKalmanGains(NStep, TransitionMatrix, ObservationMatrix, TransitionCovariance, ObservationCovariance,
+                      StateCovariance, BFirst=True):
+    """
+    Returns the gains of a scalar Kalman filter. The gains do not depend on the data, and converge to the steady-state gain:
+    the recursion stops once the gain does not change anymore and the remaining gains are the steady-state one.
+
+    Args:
+        NStep (int): Number of steps.
+        TransitionMatrix, ObservationMatrix, TransitionCovariance, ObservationCovariance (float): Scalar model.
+        StateCovariance (float): Covariance of the state before the first step (after the last update of a previous call).
+        BFirst (bool): If True, the first step has no prediction (the state covariance is the initial one, as pykalman).
+
+    Returns:
+        Gains (numpy.ndarray): Gain of each step.
+        NVar (int): Number of steps before the steady state (the gains after NVar are all equal).
+        StateCovariance (float): Covariance of the state after the last step.
+    """
+    A, H, Q, R = TransitionMatrix, ObservationMatrix, TransitionCovariance, ObservationCovariance
+    P = StateCovariance
+    Gains = np.empty(NStep)
+    NVar = NStep
+    for Step in range(NStep):
+        if not (BFirst and Step == 0):
+            P = A * P * A + Q
+        K = P * H / (H * P * H + R)
+        P = (1 - K * H) * P
+        Gains[Step] = K
+        if Step > 0 and abs(K - Gains[Step - 1]) <= 4 * np.finfo(float).eps * abs(K):
+            Gains[Step:] = K
+            NVar = Step
+            break
+    return Gains, NVar, P
+
+def ScalarKalmanFilter(Data, TransitionMatrix=1, ObservationMatrix=1, TransitionCovariance=0.01, ObservationCovariance=1,
+                       StateMean=0, StateCovariance=1, BFirst=True):
+    """
+    Scalar Kalman filter of the channels of Data (along the first axis), vectorized over the channels.
+    The steps before the steady state are run one by one, the steady state is a first-order recursive filter (lfilter).
+
+    Args:
+        Data (array): Observations, one row per step (1D or 2D with one channel per column).
+        TransitionMatrix, ObservationMatrix, TransitionCovariance, ObservationCovariance (float): Scalar model.
+        StateMean (float or array): Mean of the state before the first step (one per channel or shared).
+        StateCovariance (float): Covariance of the state before the first step.
+        BFirst (bool): If True, the first step has no prediction (as pykalman).
+
+    Returns:
+        StateMeans (numpy.ndarray): Filtered states, same shape as Data.
+        StateCovariances (numpy.ndarray): Covariance of the filtered state of each step.
+        Gains (numpy.ndarray): Gain of each step.
+    """
+    A, H = TransitionMatrix, ObservationMatrix
+    Data = np.asarray(Data, dtype=float)
+    NStep = Data.shape[0]
+    Gains, NVar, _ = ScalarKalmanGains(NStep, A, H, TransitionCovariance, ObservationCovariance, StateCovariance, BFirst)
+
+    # Covariances of the filtered states (same recursion as the gains)
+    StateCovariances = np.empty(NStep)
+    P = StateCovariance
+    for Step in range(min(NVar + 1, NStep)):
+        if not (BFirst and Step == 0):
+            P = A * P * A + TransitionCovariance
+        P = (1 - Gains[Step] * H) * P
+        StateCovariances[Step] = P
+    StateCovariances[NVar + 1:] = P
+
+    # Steps before the steady state
+    StateMeans = np.empty_like(Data)
+    X = np.broadcast_to(np.asarray(StateMean, dtype=float), Data.shape[1:]).copy()
+    for Step in range(min(NVar, NStep)):
+        if not (BFirst and Step == 0):
+            X = A * X
+        X = X + Gains[Step] * (Data[Step] - H * X)
+        StateMeans[Step] = X
+
+    # Steady state: X[n] = K Z[n] + (1 - K H) A X[n-1]
+    if NVar < NStep:
+        K = Gains[NVar]
+        Coef = (1 - K * H) * A
+        StateMeans[NVar:], _ = lfilter([K], [1, -Coef], Data[NVar:], axis=0, zi=(Coef * X)[np.newaxis])
+    return StateMeans, StateCovariances, Gains
+
+def ScalarKalmanSmoother(StateMeans, StateCovariances, TransitionMatrix=1, TransitionCovariance=0.01):
+    """
+    Rauch-Tung-Striebel smoother of the states of ScalarKalmanFilter (along the first axis), vectorized over the channels.
+    The smoother gain is constant where the filter is in steady state, this part is run backward with lfilter.
+
+    Args:
+        StateMeans (numpy.ndarray): Filtered states.
+        StateCovariances (numpy.ndarray): Covariance of the filtered state of each step.
+        TransitionMatrix, TransitionCovariance (float): Scalar model.
+
+    Returns:
+        SmoothedMeans (numpy.ndarray): Smoothed states, same shape as StateMeans.
+    """
+    A = TransitionMatrix
+    NStep = StateMeans.shape[0]
+    SmoothedMeans = np.empty_like(StateMeans)
+    SmoothedMeans[-1] = StateMeans[-1]
+    if NStep < 2:
+        return SmoothedMeans
+
+    # Smoother gains C[n] = P[n] A / (A P[n] A + Q)
+    Gains = StateCovariances * A / (A * StateCovariances * A + TransitionCovariance)
+
+    # Steady part, run backward: S[n] = (1 - C A) M[n] + C S[n+1]
+    Start = NStep - 2
+    while Start > 0 and Gains[Start - 1] == Gains[NStep - 2]:
+        Start -= 1
+    C = Gains[NStep - 2]
+    Reversed, _ = lfilter([1 - C * A], [1, -C], StateMeans[Start:NStep - 1][::-1], axis=0,
+                          zi=(C * SmoothedMeans[-1])[np.newaxis])
+    SmoothedMeans[Start:NStep - 1] = Reversed[::-1]
+
+    # Steps before the steady state
+    for Step in range(Start - 1, -1, -1):
+        SmoothedMeans[Step] = StateMeans[Step] + Gains[Step] * (SmoothedMeans[Step + 1] - A * StateMeans[Step])
+    return SmoothedMeans
+
+
+"""
+Streaming filters
+
+Filters keeping their state between the chunks of a signal received piece by piece (live acquisition).
+The output over chunked input is the output of the causal filter over the whole signal, and the memory does not depend
+on the length of the stream. The chunks are 1D arrays or 2D arrays with one channel per column (time along the first axis).
+"""
+class StreamIIR:
+    def __init__(self, FSample=1.0, FCut=0.1, Order=4, BType='low', FilterType='butter'):
+        """
+        Butterworth or Bessel filter (causal, sosfilt) with its state carried between the chunks.
+
+        Args:
+            FSample (float): Sampling frequency of the data.
+            FCut (float): Cutoff frequency of the filter.
+            Order (int): Order of the filter.
+            BType (str): Type of the filter. Can be 'low', 'high', 'bandpass' or 'bandstop'.
+            FilterType (str): 'butter' or 'bessel'.
+        """
+        # Own copy: sosfilt needs a writable array, the cached design is read-only
+        self.SOS = np.array(DesignFilter(FilterType, Order, FilterKey(FCut), float(FSample), BType, 'sos'))
+        self.ZI = None  # State of the sections
+
+    def Reset(self):
+        self.ZI = None
+
+    def Filter(self, Chunk):
+        """
+        Filters the next chunk of the signal.
+
+        Args:
+            Chunk (array): Next samples.
+
+        Returns:
+            Data (array): Filtered samples.
+        """
+        Chunk = np.asarray(Chunk, dtype=float)
+        if len(Chunk) == 0:
+            return Chunk
+        if self.ZI is None:
+            self.ZI = np.zeros((self.SOS.shape[0], 2) + Chunk.shape[1:])
+        Result, self.ZI = sosfilt(self.SOS, Chunk, axis=0, zi=self.ZI)
+        return Result
+
+class StreamMovingAverage:
+    def __init__(self, FWindow=5):
+        """
+        Trailing moving average over the FWindow last samples (the samples before the start are zero, as lfilter).
+        The FWindow - 1 last samples are kept between the chunks.
+
+        Args:
+            FWindow (int): Size of the moving average window.
+        """
+        self.FWindow = FWindow
+        self.Buffer = None  # FWindow - 1 last samples
+
+    def Reset(self):
+        self.Buffer = None
+
+    def Filter(self, Chunk):
+        """
+        Filters the next chunk of the signal.
+
+        Args:
+            Chunk (array): Next samples.
+
+        Returns:
+            Data (array): Filtered samples.
+        """
+        Chunk = np.asarray(Chunk, dtype=float)
+        if len(Chunk) == 0:
+            return Chunk
+        if self.Buffer is None:
+            self.Buffer = np.zeros((self.FWindow - 1,) + Chunk.shape[1:])
+        Extended = np.concatenate((self.Buffer, Chunk))
+
+        # Sums of the windows from the cumulative sum of the chunk (drift limited to one chunk)
+        CumSum = np.cumsum(Extended, axis=0)
+        Sums = CumSum[self.FWindow - 1:].copy()
+        Sums[1:] -= CumSum[:-self.FWindow]
+        self.Buffer = Extended[len(Extended) - (self.FWindow - 1):]
+        return Sums / self.FWindow
+
+class StreamMedian:
+    def __init__(self, FWindow=5):
+        """
+        Trailing running median over the FWindow last samples (the samples before the start are zero).
+        The FWindow - 1 last samples are kept between the chunks, the windows of a chunk are sorted at once.
+
+        Args:
+            FWindow (int): Size of the median window.
+        """
+        self.FWindow = FWindow
+        self.Buffer = None  # FWindow - 1 last samples
+
+    def Reset(self):
+        self.Buffer = None
+
+    def Filter(self, Chunk):
+        """
+        Filters the next chunk of the signal.
+
+        Args:
+            Chunk (array): Next samples.
+
+        Returns:
+            Data (array): Filtered samples.
+        """
+        Chunk = np.asarray(Chunk, dtype=float)
+        if len(Chunk) == 0:
+            return Chunk
+        if self.Buffer is None:
+            self.Buffer = np.zeros((self.FWindow - 1,) + Chunk.shape[1:])
+        Extended = np.concatenate((self.Buffer, Chunk))
+        self.Buffer = Extended[len(Extended) - (self.FWindow - 1):]
+        return np.median(sliding_window_view(Extended, self.FWindow, axis=0), axis=-1)
+
+class StreamKalman:
+    def __init__(self, TransitionMatrix=1, ObservationMatrix=1, InitialStateMean=0,
+                 InitialStateCovariance=1, ObservationCovariance=1, TransitionCovariance=0.01):
+        """
+        Scalar Kalman filter updated chunk by chunk (same model and results as DataTreatment.DTKalman).
+        The state mean and covariance are kept between the chunks.
+        """
+        self.TransitionMatrix = TransitionMatrix
+        self.ObservationMatrix = ObservationMatrix
+        self.InitialStateMean = InitialStateMean
+        self.InitialStateCovariance = InitialStateCovariance
+        self.ObservationCovariance = ObservationCovariance
+        self.TransitionCovariance = TransitionCovariance
+        self.Reset()
+
+    def Reset(self):
+        self.StateMean = self.InitialStateMean
+        self.StateCovariance = self.InitialStateCovariance
+        self.BFirst = True
+
+    def Filter(self, Chunk):
+        """
+        Filters the next chunk of the signal.
+
+        Args:
+            Chunk (array): Next observations.
+
+        Returns:
+            Data (array): Filtered states.
+        """
+        Chunk = np.asarray(Chunk, dtype=float)
+        if len(Chunk) == 0:
+            return Chunk
+        StateMeans, StateCovariances, _ = ScalarKalmanFilter(Chunk, self.TransitionMatrix, self.ObservationMatrix,
+                                                             self.TransitionCovariance, self.ObservationCovariance,
+                                                             self.StateMean, self.StateCovariance, self.BFirst)
+        self.StateMean = StateMeans[-1]
+        self.StateCovariance = StateCovariances[-1]
+        self.BFirst = False
+        return StateMeans
+
+"""
+Pipeline
+
+Chain of treatments (DataTreatment filters, derivative, integral) declared once and run on the channels of the data,
+one channel per column (time along the first axis).
+- The channels are processed by blocks run in a thread pool (scipy releases the GIL).
+- With BCache, the output of each stage is kept, keyed on the hash of the input and the stages with their parameters:
+  after a change of the parameters of a stage, only this stage and the next ones are computed again.
+  The cache is bounded (number of arrays and bytes) and the cached arrays are read-only.
+- Without BCacheStages, the stages are fused: every stage of a block runs before the next block, so the intermediate
+  arrays are the size of a block and not of the whole data, and only the output of the pipeline is cached.
+"""
+class Pipeline:
+    def __init__(self, NWorkers=None, ChannelBlock=16, BCache=True, BCacheStages=True, MaxCache=8, MaxCacheBytes=2**30):
+        """
+        Args:
+            NWorkers (int): Number of threads, None for the default of ThreadPoolExecutor, 1 to run without threads.
+            ChannelBlock (int): Number of channels per block.
+            BCache (bool): If True, the outputs are cached.
+            BCacheStages (bool): If True (with BCache), the output of each stage is cached, so that a change of parameters
+                                 only recomputes the stage and the next ones. If False, the stages are fused by blocks
+                                 of channels and only the output of the pipeline is cached.
+            MaxCache (int): Number of arrays kept in the cache (the least recently used are dropped).
+            MaxCacheBytes (int): Memory of the arrays kept in the cache (the least recently used are dropped).
+        """
+        self.Stages = []  # List of (Name, Function, Params)
+        self.NWorkers = NWorkers
+        self.ChannelBlock = ChannelBlock
+        self.BCache = BCache
+        self.BCacheStages = BCacheStages
+        self.MaxCache = MaxCache
+        self.MaxCacheBytes = MaxCacheBytes
+        self.Cache = OrderedDict()
+        self.Treatment = DataTreatment()
+
+    def Add(self, Stage, **Params):
+        """
+        Adds a stage at the end of the pipeline.
+
+        Args:
+            Stage (str or callable): Name of a DataTreatment filter without DT (e.g. 'Butterworth', 'MedianFilter'),
+                                     'Derivative' (CMPTDerivativeFirst), 'Integral' (CMPTIntegralTrap),
+                                     or a function f(Data, Axis=0, **Params).
+            Params: Parameters of the stage.
+
+        Returns:
+            Pipeline: The pipeline itself, to chain the stages.
+        """
+        if callable(Stage):
+            Name, Function = getattr(Stage, '__qualname__', repr(Stage)), Stage
+        elif Stage == 'Derivative':
+            Name, Function = Stage, CMPTDerivativeFirst
+        elif Stage == 'Integral':
+            Name, Function = Stage, CMPTIntegralTrap
+        elif hasattr(self.Treatment, 'DT' + Stage):
+            Name, Function = Stage, getattr(self.Treatment, 'DT' + Stage)
+        else:
+            print(f"Error: Unknown stage {Stage}.")
+            return self
+        self.Stages.append((Name, Function, Params))
+        return self
+
+    def SetParams(self, Index, **Params):
+        """ Changes parameters of a stage (the cached outputs of the previous stages are kept)."""
+        self.Stages[Index][2].update(Params)
+        return self
+
+    def ClearCache(self):
+        self.Cache.clear()
+
+    def StageKey(self, Index):
+        """
+        Returns the key of a stage: its name, its function if it is given as a callable (e.g. lambdas share the name
+        '<lambda>', the key keeps a reference to the function so that its id is not reused), and its parameters
+        (the arrays by their hash).
+        """
+        Name, Function, Params = self.Stages[Index]
+        Params = tuple(sorted((Key, HashArray(Val) if isinstance(Val, np.ndarray) else repr(Val)) for Key, Val in Params.items()))
+        if Name in ('Derivative', 'Integral') or Name == getattr(Function, '__name__', '')[2:]:
+            return (Name, Params)
+        return (Name, Function, Params)
+
+    def CacheStore(self, Key, Result):
+        """ Keeps a read-only result in the cache, then drops the least recently used ones over MaxCache or MaxCacheBytes."""
+        Result.flags.writeable = False
+        self.Cache[Key] = Result
+        while len(self.Cache) > 1 and (len(self.Cache) > self.MaxCache or
+                                       sum(Val.nbytes for Val in self.Cache.values()) > self.MaxCacheBytes):
+            self.Cache.popitem(last=False)
+
+    def RunBlocks(self, Data, Stages):
+        """
+        Runs stages on the data, block of channels by block of channels.
+
+        Args:
+            Data (numpy.ndarray): 2D data, one channel per column.
+            Stages (list): Stages to run.
+
+        Returns:
+            Result (numpy.ndarray): Output of the last stage.
+        """
+        NChannel = Data.shape[1]
+        Blocks = [(Start, min(Start + self.ChannelBlock, NChannel)) for Start in range(0, NChannel, self.ChannelBlock)]
+
+        def RunBlock(Block):
+            Out = Data[:, Block[0]:Block[1]]
+            for _, Function, Params in Stages:
+                Out = Function(Out, Axis=0, **Params)
+            return Out
+
+        if self.NWorkers == 1 or len(Blocks) == 1:
+            Outs = map(RunBlock, Blocks)
+            return self.StackBlocks(Blocks, Outs, NChannel)
+        with ThreadPoolExecutor(self.NWorkers) as Pool:
+            return self.StackBlocks(Blocks, Pool.map(RunBlock, Blocks), NChannel)
+
+    @staticmethod
+    def StackBlocks(Blocks, Outs, NChannel):
+        """ Writes the outputs of the blocks in one array, as soon as each block is done."""
+        Result = None
+        for (Start, Stop), Out in zip(Blocks, Outs):
+            if Result is None:
+                Result = np.empty((Out.shape[0], NChannel), dtype=Out.dtype)
+            Result[:, Start:Stop] = Out
+        return Result
+
+    def Run(self, Data):
+        """
+        Runs the pipeline.
+
+        Args:
+            Data (array): Input data (1D, or 2D with one channel per column).
+
+        Returns:
+            Data (array): Output of the last stage.
+        """
+        Data = np.asarray(Data, dtype=float)
+        B1D = Data.ndim == 1
+        if B1D:
+            Data = Data[:, np.newaxis]
+        if not self.Stages:
+            return Data[:, 0] if B1D else Data
+
+        if not self.BCache:
+            Result = self.RunBlocks(Data, self.Stages)
+        else:
+            Keys = [HashArray(Data)] + [self.StageKey(Index) for Index in range(len(self.Stages))]
+
+            # Output of the longest chain of stages already computed
+            Result, First = Data, 0
+            for Index in range(len(self.Stages), 0, -1):
+                Key = tuple(Keys[:Index + 1])
+                if Key in self.Cache:
+                    self.Cache.move_to_end(Key)
+                    Result, First = self.Cache[Key], Index
+                    break
+
+            # Next stages, one by one to cache each output (default), or fused with only the final output cached
+            if First < len(self.Stages):
+                if self.BCacheStages:
+                    for Index in range(First, len(self.Stages)):
+                        Result = self.RunBlocks(Result, [self.Stages[Index]])
+                        self.CacheStore(tuple(Keys[:Index + 2]), Result)
+                else:
+                    Result = self.RunBlocks(Result, self.Stages[First:])
+                    self.CacheStore(tuple(Keys), Result)
+
+        return Result[:, 0] if B1D else Result
+
+def HashArray(Data):
+    """ Returns a key of the content of an array (shape, dtype and hash of the values)."""
+    Data = np.ascontiguousarray(Data)
+    return (Data.shape, Data.dtype.str, hashlib.blake2b(Data.view(np.uint8).reshape(-1), digest_size=16).hexdigest())
+
 # Math functions
-def CMPTDerivativeFirst(DataVal, DataAbs=None):
+def CMPTDerivativeFirst(DataVal, DataAbs=None, Axis=0):
     """
     Computes the numerical derivative of the data.
     
     Args:
-        DataVal (array): Input data array.
+        DataVal (array): Input data array (1D, or 2D with one channel per column for Axis=0).
         DataAbs (array): Optional array of time or x-values corresponding to DataVal.
+        Axis (int): Axis along which the data is derived.
         Derivative (array): Numerical derivative of the data.
     """
     DataVal = np.asarray(DataVal)
     if DataAbs is None:
         # Assume uniform spacing
-        Derivative = np.gradient(DataVal)
+        Derivative = np.gradient(DataVal, axis=Axis)
     else:
         DataAbs = np.asarray(DataAbs)
-        Derivative = np.gradient(DataVal, DataAbs)
+        Derivative = np.gradient(DataVal, DataAbs, axis=Axis)
     return Derivative
 
-def CMPTIntegralTrap(VectDerivative, DataAbs=None, FInitialVal=0, FDx=1.0):
+def CMPTIntegralTrap(VectDerivative, DataAbs=None, FInitialVal=0, FDx=1.0, Axis=0):
     """
     Computes the numerical integral of the data using the trapezoidal rule.
     
     Args:
-        VectDerivative (array): Numerical derivative of the data.
+        VectDerivative (array): Numerical derivative of the data (1D, or 2D with one channel per column for Axis=0).
         DataAbs (array): Optional array of time or x-values corresponding to DataVal.
-        FInitialVal (float): Optional initial value for the integral.
+        FInitialVal (float or array): Optional initial value for the integral (one per channel or shared).
         FDx (float): Optional spacing between data points if DataAbs is not provided.
+        Axis (int): Axis along which the data is integrated.
         
     Returns:
         Integral (array): Numerical integral of the data.
@@ -186,14 +784,16 @@ def CMPTIntegralTrap(VectDerivative, DataAbs=None, FInitialVal=0, FDx=1.0):
 
     if DataAbs is None:
         # Assume uniform spacing
-        Integral = integrate.cumulative_trapezoid(y=Derivative, dx=FDx, initial=FInitialVal)
+        Integral = integrate.cumulative_trapezoid(y=Derivative, dx=FDx, axis=Axis, initial=0)
     else:
         DataAbs = np.asarray(DataAbs, dtype=float)
         # Check if DataAbs is the same length as Derivative
-        if LenData(DataAbs) != LenData(Derivative):
+        if LenData(DataAbs) != Derivative.shape[Axis]:
             print("Error: DataAbs and Derivative must have the same length.")
             return None
 
         # Trapezoidal integration
-        Integral = integrate.cumulative_trapezoid(y=Derivative, x=DataAbs, initial=FInitialVal)
-    return Integral
\ No newline at end of file
+        Integral = integrate.cumulative_trapezoid(y=Derivative, x=DataAbs, axis=Axis, initial=0)
+
+    # Initial value of the integral (scipy only accepts 0 as initial value)
+    return Integral + np.expand_dims(FInitialVal, Axis) if np.ndim(FInitialVal) else Integral + FInitialVal
\ No newline at end of file